@@ -14,6 +14,7 @@ from rich.prompt import Prompt, Confirm
 import time
 
 from ..core.migration_manager import MigrationManager
+from ..migrators.mysql_to_postgresql import DEFAULT_COMMIT_ROWS, DEFAULT_COPY_ROWS, DEFAULT_FETCH_SIZE
 from ..utils.logger import setup_logger
 
 
@@ -33,7 +34,9 @@ def cli():
 @click.option('--target', '-t', help='目标数据库连接字符串')
 @click.option('--tables', help='要迁移的表，逗号分隔')
 @click.option('--exclude-tables', help='要排除的表，逗号分隔')
-@click.option('--batch-size', type=int, default=1000, help='批处理大小')
+@click.option('--batch-size', type=int, default=DEFAULT_FETCH_SIZE, help='每次从源库读取的行数')
+@click.option('--copy-rows', type=int, default=DEFAULT_COPY_ROWS, help='每次写入目标库的行数')
+@click.option('--commit-rows', type=int, default=DEFAULT_COMMIT_ROWS, help='每写入多少行提交一次')
 @click.option('--workers', type=int, default=4, help='并发工作线程数')
 @click.option('--dry-run', is_flag=True, help='模拟运行，不实际执行迁移')
 @click.option('--drop-target', is_flag=True, help='删除目标表')
@@ -41,8 +44,8 @@ def cli():
 @click.option('--no-foreign-keys', is_flag=True, help='不迁移外键')
 @click.option('--log-level', type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR']),
               default='INFO', help='日志级别')
-def migrate(config, source, target, tables, exclude_tables, batch_size, workers,
-           dry_run, drop_target, no_indexes, no_foreign_keys, log_level):
+def migrate(config, source, target, tables, exclude_tables, batch_size, copy_rows, commit_rows,
+           workers, dry_run, drop_target, no_indexes, no_foreign_keys, log_level):
     """执行数据库迁移"""
 
     # 设置日志
@@ -63,6 +66,8 @@ def migrate(config, source, target, tables, exclude_tables, batch_size, workers,
                 'target': parse_connection_string(target),
                 'options': {
                     'batch_size': batch_size,
+                    'copy_rows': copy_rows,
+                    'commit_rows': commit_rows,
                     'workers': workers,
                     'drop_target': drop_target,
                     'migrate_indexes': not no_indexes,
@@ -180,7 +185,7 @@ def interactive():
     config_data['migration']['options']['drop_target'] = Confirm.ask("是否删除目标表？", default=True)
     config_data['migration']['options']['migrate_indexes'] = Confirm.ask("是否迁移索引？", default=True)
     config_data['migration']['options']['migrate_foreign_keys'] = Confirm.ask("是否迁移外键？", default=True)
-    config_data['migration']['options']['batch_size'] = int(Prompt.ask("批处理大小", default="1000"))
+    config_data['migration']['options']['batch_size'] = int(Prompt.ask("批处理大小", default=str(DEFAULT_FETCH_SIZE)))
     config_data['migration']['options']['workers'] = int(Prompt.ask("并发线程数", default="4"))
 
     # 保存配置
@@ -203,6 +208,8 @@ def interactive():
             tables=None,
             exclude_tables=None,
             batch_size=config_data['migration']['options']['batch_size'],
+            copy_rows=DEFAULT_COPY_ROWS,
+            commit_rows=DEFAULT_COMMIT_ROWS,
             workers=config_data['migration']['options']['workers'],
             dry_run=False,
             drop_target=config_data['migration']['options']['drop_target'],
@@ -341,8 +348,14 @@ migration:
     # 要排除的表
     exclude_tables: []
     
-    # 批处理大小
-    batch_size: 1000
+    # 每次从源库读取的行数
+    batch_size: 10000
+    
+    # 每次写入目标库的行数
+    copy_rows: 50000
+    
+    # 每写入多少行提交一次
+    commit_rows: 500000
     
     # 并发数
     workers: 4
@@ -30,7 +30,9 @@ class MySQLConnector(BaseConnector):
             self.connection_params['auth_plugin'] = options['auth_plugin']
 
     def connect(self) -> bool:
-        """建立数据库连接"""
+        """建立数据库连接，已有可用连接时直接复用"""
+        if self.is_connected():
+            return True
         try:
             self.connection = mysql.connector.connect(**self.connection_params)
             self.logger.info(f"Connected to MySQL database: {self.config.get('database')}")
@@ -45,10 +47,17 @@ class MySQLConnector(BaseConnector):
             self.connection.close()
             self.logger.info("Disconnected from MySQL database")
 
+    def is_connected(self) -> bool:
+        """当前是否持有可用的连接"""
+        try:
+            return bool(self.connection and self.connection.is_connected())
+        except Error:
+            return False
+
     def test_connection(self) -> bool:
         """测试数据库连接是否正常"""
         try:
-            if not self.connection or not self.connection.is_connected():
+            if not self.is_connected():
                 self.connect()
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
@@ -495,6 +504,178 @@ class MySQLConnector(BaseConnector):
         finally:
             cursor.close()
 
+    def get_approx_table_count(self, table_name: str) -> int:
+        """获取表的估算行数
+
+        读取 information_schema.TABLES.TABLE_ROWS，不扫描表；
+        InnoDB 下为统计估算值，TABLE_ROWS 为 NULL 时回退到 COUNT(*)。
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table_name,)
+            )
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        if row is None or row[0] is None:
+            return self.get_table_count(table_name)
+        return int(row[0])
+
+    def get_column_range(self, table_name: str, column_name: str) -> Tuple[Any, Any]:
+        """获取列的最小值和最大值（主键列上只需读取索引两端）"""
+        cursor = self.connection.cursor()
+        try:
+            column = column_name.replace('`', '``')
+            cursor.execute(f"SELECT MIN(`{column}`), MAX(`{column}`) FROM `{table_name}`")
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def get_schema_preview(self, min_rows: Optional[int] = None,
+                           max_rows: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """获取当前库所有表的估算行数、列数和占用空间
+
+        只需两次 information_schema 查询，用于迁移预览和表选择。
+
+        Args:
+            min_rows: 只返回估算行数不少于该值的表 (可选)
+            max_rows: 只返回估算行数不多于该值的表 (可选)
+
+        Returns:
+            Dict: {表名: {'rows': 估算行数（TABLE_ROWS 为 NULL 时为 None）,
+                          'columns': 列数,
+                          'size_bytes': 数据和索引占用的字节数}}
+        """
+        # 按行数过滤时在服务端完成，指定过滤条件后 TABLE_ROWS 为 NULL 的表不会返回
+        table_filter = "TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'"
+        params = []
+        if min_rows is not None:
+            table_filter += " AND TABLE_ROWS >= %s"
+            params.append(min_rows)
+        if max_rows is not None:
+            table_filter += " AND TABLE_ROWS <= %s"
+            params.append(max_rows)
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT TABLE_NAME, TABLE_ROWS, "
+                "COALESCE(DATA_LENGTH, 0) + COALESCE(INDEX_LENGTH, 0) "
+                f"FROM information_schema.TABLES WHERE {table_filter}",
+                params
+            )
+            tables = cursor.fetchall()
+
+            column_query = ("SELECT TABLE_NAME, COUNT(*) FROM information_schema.COLUMNS "
+                            "WHERE TABLE_SCHEMA = DATABASE()")
+            if params:
+                column_query += (" AND TABLE_NAME IN (SELECT TABLE_NAME FROM information_schema.TABLES "
+                                 f"WHERE {table_filter})")
+            cursor.execute(column_query + " GROUP BY TABLE_NAME", params)
+            column_counts = dict(cursor.fetchall())
+        finally:
+            cursor.close()
+
+        return {
+            table_name: {
+                'rows': table_rows,
+                'columns': column_counts.get(table_name, 0),
+                'size_bytes': int(size_bytes)
+            }
+            for table_name, table_rows, size_bytes in tables
+        }
+
+    def get_schema_fingerprint(self) -> str:
+        """获取当前库表结构的指纹，用于判断缓存的元数据是否过期
+
+        由表数量、最近创建时间和最近更新时间组成，只需一次 information_schema 查询。
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT COUNT(*), MAX(CREATE_TIME), MAX(UPDATE_TIME) "
+                "FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'"
+            )
+            return '|'.join(str(value) for value in cursor.fetchone())
+        finally:
+            cursor.close()
+
+    def prefetch_schema(self) -> Dict[str, Dict[str, Any]]:
+        """一次性获取当前库所有表的结构、索引和估算行数
+
+        共三次 information_schema 查询，替代每张表分别执行
+        DESCRIBE / SHOW INDEX / COUNT(*)。
+
+        Returns:
+            Dict: {'structures': {表名: 与 get_table_structure 相同格式的列列表},
+                   'indexes': {表名: 与 get_indexes 相同格式的索引列表},
+                   'counts': {表名: 估算行数（TABLE_ROWS 为 NULL 时为 None）}}
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'"
+            )
+            counts = {table_name: table_rows for table_name, table_rows in cursor.fetchall()}
+
+            cursor.execute(
+                "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, "
+                "COLUMN_DEFAULT, EXTRA "
+                "FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+            )
+            structures = {table_name: [] for table_name in counts}
+            for table_name, field, col_type, nullable, key, default, extra in cursor.fetchall():
+                if table_name not in structures:
+                    continue
+                structures[table_name].append({
+                    'Field': field,
+                    'Type': col_type,
+                    'Null': nullable,
+                    'Key': key,
+                    'Default': default,
+                    'Extra': extra
+                })
+
+            cursor.execute(
+                "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SEQ_IN_INDEX, "
+                "COLLATION, INDEX_TYPE "
+                "FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() "
+                "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+            )
+            grouped = {table_name: {} for table_name in counts}
+            for table_name, index_name, non_unique, column_name, seq, collation, index_type in cursor.fetchall():
+                table_indexes = grouped.get(table_name)
+                if table_indexes is None:
+                    continue
+                if index_name not in table_indexes:
+                    table_indexes[index_name] = {
+                        'name': index_name,
+                        'is_unique': int(non_unique) == 0,
+                        'is_primary': index_name == 'PRIMARY',
+                        'columns': [],
+                        'type': index_type or 'BTREE'
+                    }
+                table_indexes[index_name]['columns'].append({
+                    'name': column_name,
+                    'order': seq,
+                    'direction': 'ASC' if collation == 'A' else 'DESC'
+                })
+            indexes = {table_name: list(table_indexes.values())
+                       for table_name, table_indexes in grouped.items()}
+
+            return {'structures': structures, 'indexes': indexes, 'counts': counts}
+        finally:
+            cursor.close()
+
     def get_table_structure(self, table_name: str) -> List[Dict[str, Any]]:
         """获取表结构信息"""
         cursor = self.connection.cursor()
@@ -527,6 +708,48 @@ class MySQLConnector(BaseConnector):
         finally:
             cursor.close()
 
+    def stream_table_data(self, table_name: str, batch_size: int = 1000, where_clause: str = "",
+                          select_exprs: Optional[List[str]] = None):
+        """流式读取表数据
+
+        使用非缓冲游标只扫描一次表，每次取 batch_size 行，
+        客户端内存占用只与单批大小有关，与表大小无关。
+        select_exprs 为要查询的列表达式（如在服务器端完成类型转换），默认为 *。
+        """
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            select_list = ', '.join(select_exprs) if select_exprs else '*'
+            query = f"SELECT {select_list} FROM `{table_name}`"
+            if where_clause:
+                query += f" WHERE {where_clause}"
+            cursor.execute(query)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if self.connection.unread_result:
+                # 提前退出时不读完剩余结果（大表会因此整表传输），直接断开连接，
+                # 下次 connect() 时重新连接
+                self._abort_connection()
+            else:
+                cursor.close()
+
+    def _abort_connection(self) -> None:
+        """不发送 QUIT、不读取未读结果，直接关闭连接"""
+        try:
+            self.connection.shutdown()
+        except NotImplementedError:
+            # C 扩展连接不支持 shutdown
+            try:
+                self.connection.close()
+            except Error:
+                pass
+        self.connection = None
+        self.logger.warning("Aborted MySQL connection with unread streaming results")
+
     def insert_data(self, table_name: str, columns: List[str], data: List[Tuple]) -> bool:
         """插入数据到表中"""
         if not data:
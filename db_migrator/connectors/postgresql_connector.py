@@ -3,14 +3,63 @@
 PostgreSQL Database Connector
 """
 
+import csv
+import datetime
+import struct
+import tempfile
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from ..core.base_connector import BaseConnector, TableInfo, ColumnInfo
 
 
+# COPY 数据在内存中缓冲的上限，超出后写入临时文件
+COPY_SPOOL_MAX_SIZE = 64 << 20
+
+# 二进制 COPY 格式（网络字节序）
+_COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+_COPY_BINARY_TRAILER = struct.pack('>h', -1)
+_INT2 = struct.Struct('>h')
+_INT4 = struct.Struct('>i')
+_INT8 = struct.Struct('>q')
+_FLOAT4 = struct.Struct('>f')
+_FLOAT8 = struct.Struct('>d')
+_NULL_FIELD = _INT4.pack(-1)
+_PG_EPOCH = datetime.datetime(2000, 1, 1)
+_PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+def _encode_text(value) -> bytes:
+    # 字节类型原样发送，其余类型（int、Decimal、set 等）按文本表示编码
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if not isinstance(value, str):
+        value = str(value)
+    return value.encode('utf-8')
+
+
+# 目标列类型（format_type 名称）-> 二进制编码函数，只包含编码简单且无歧义的类型
+_BINARY_ENCODERS = {
+    'smallint': _INT2.pack,
+    'integer': _INT4.pack,
+    'bigint': _INT8.pack,
+    'real': _FLOAT4.pack,
+    'double precision': _FLOAT8.pack,
+    'boolean': lambda value: b'\x01' if value else b'\x00',
+    'text': _encode_text,
+    'character varying': _encode_text,
+    'character': _encode_text,
+    'json': _encode_text,
+    'bytea': bytes,
+    'timestamp without time zone': lambda value: _INT8.pack((value - _PG_EPOCH) // _ONE_MICROSECOND),
+    'date': lambda value: _INT4.pack((value - _PG_EPOCH_DATE).days),
+}
+
+
 class PostgreSQLConnector(BaseConnector):
     """PostgreSQL数据库连接器"""
     
@@ -26,19 +75,31 @@ class PostgreSQLConnector(BaseConnector):
         
     def connect(self) -> bool:
         """
-        连接到PostgreSQL数据库
+        连接到PostgreSQL数据库，已有可用连接时直接复用
+        
+        默认开启 TCP keepalive，避免长时间的 COPY 会话被防火墙断开；
+        可通过 options 覆盖。
         
         Returns:
             bool: 连接是否成功
         """
+        if self.is_connected():
+            return True
+        
         try:
+            options = {
+                'application_name': 'db-migrator',
+                'keepalives': 1,
+                'keepalives_idle': 60,
+                **self.config.get('options', {})
+            }
             self.connection = psycopg2.connect(
                 host=self.config['host'],
                 port=self.config.get('port', 5432),
                 user=self.config['username'],
                 password=self.config['password'],
                 database=self.config['database'],
-                **self.config.get('options', {})
+                **options
             )
             self.connection.autocommit = False
             logging.info(f"成功连接到PostgreSQL数据库: {self.config['database']}")
@@ -54,6 +115,10 @@ class PostgreSQLConnector(BaseConnector):
             self.connection = None
             logging.info("PostgreSQL数据库连接已断开")
     
+    def is_connected(self) -> bool:
+        """当前是否持有可用的连接"""
+        return bool(self.connection and not self.connection.closed)
+    
     def get_tables(self, schema: Optional[str] = None) -> List[str]:
         """
         获取所有表名
@@ -304,12 +369,12 @@ class PostgreSQLConnector(BaseConnector):
             return False
         
         try:
-            placeholders = ','.join(['%s'] * len(columns))
             column_names = ','.join([f'"{col}"' for col in columns])
-            query = f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
+            query = f'INSERT INTO "{table_name}" ({column_names}) VALUES %s'
             
+            # 多行 VALUES 插入，每页一条语句，而不是逐行执行
             with self.connection.cursor() as cursor:
-                cursor.executemany(query, data)
+                execute_values(cursor, query, data, page_size=1000)
                 self.connection.commit()
                 return True
         except Exception as e:
@@ -317,13 +382,217 @@ class PostgreSQLConnector(BaseConnector):
             self.connection.rollback()
             return False
     
-    def create_table(self, table_name: str, columns: List[Dict[str, Any]]) -> bool:
+    def copy_data(self, table_name: str, columns: List[str], data: List[Tuple],
+                  commit: bool = True, freeze: bool = False) -> bool:
+        """
+        使用 COPY FROM STDIN 批量写入数据（CSV格式）
+        
+        数值以外的字段都加引号，NULL 写成不带引号的 nan，
+        因此空字符串和字符串 'nan' 都不会被误认为 NULL。
+        二进制值（如 MySQL binary/varbinary 列）按 \\x 十六进制文本写入，
+        与 psycopg2 参数适配写入的结果一致。
+        
+        Args:
+            table_name: 表名
+            columns: 列名列表
+            data: 数据列表
+            commit: 是否立即提交，为False时由调用方统一提交
+            freeze: 是否使用 FREEZE 选项（表须在当前事务中创建或 TRUNCATE）
+            
+        Returns:
+            bool: 写入是否成功
+        """
+        if not self.connection or not data:
+            return False
+        
+        try:
+            column_names = ','.join([f'"{col}"' for col in columns])
+            freeze_option = ', FREEZE' if freeze else ''
+            copy_sql = (f'COPY "{table_name}" ({column_names}) '
+                        f"FROM STDIN WITH (FORMAT csv, NULL 'nan'{freeze_option})")
+            null_marker = float('nan')
+            
+            def csv_row(row):
+                """NULL 和二进制值需要转换，其余行原样写入"""
+                for value in row:
+                    if value is None or isinstance(value, _BYTES_TYPES):
+                        break
+                else:
+                    return row
+                return [null_marker if value is None
+                        else '\\x' + bytes(value).hex() if isinstance(value, _BYTES_TYPES)
+                        else value
+                        for value in row]
+            
+            # 小批量在内存中构建，大批量自动转存到临时文件
+            with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_MAX_SIZE, mode='w+',
+                                               newline='', encoding='utf-8') as buffer:
+                writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+                writer.writerows(csv_row(row) for row in data)
+                buffer.seek(0)
+                
+                with self.connection.cursor() as cursor:
+                    cursor.copy_expert(copy_sql, buffer)
+            
+            if commit:
+                self.connection.commit()
+            return True
+        except Exception as e:
+            logging.error(f"COPY写入数据失败: {e}")
+            self.connection.rollback()
+            return False
+    
+    @staticmethod
+    def supports_binary_copy(column_types: List[Optional[str]]) -> bool:
+        """判断给定的目标列类型是否都能使用二进制 COPY 编码"""
+        return all(col_type in _BINARY_ENCODERS for col_type in column_types)
+    
+    def copy_data_binary(self, table_name: str, columns: List[str], column_types: List[str],
+                         data: List[Tuple], commit: bool = True, freeze: bool = False) -> bool:
+        """
+        使用二进制格式的 COPY FROM STDIN 批量写入数据
+        
+        二进制字段按原始字节发送，只带4字节长度前缀，不需要十六进制转义。
+        调用前应先用 supports_binary_copy 确认所有列类型都受支持。
+        
+        Args:
+            table_name: 表名
+            columns: 列名列表
+            column_types: 与 columns 对应的目标列类型（get_column_types 返回的名称）
+            data: 数据列表（bytea 列为原始字节）
+            commit: 是否立即提交，为False时由调用方统一提交
+            freeze: 是否使用 FREEZE 选项（表须在当前事务中创建或 TRUNCATE）
+            
+        Returns:
+            bool: 写入是否成功
+        """
+        if not self.connection or not data:
+            return False
+        
+        try:
+            column_names = ','.join([f'"{col}"' for col in columns])
+            freeze_option = ', FREEZE' if freeze else ''
+            copy_sql = f'COPY "{table_name}" ({column_names}) FROM STDIN WITH (FORMAT binary{freeze_option})'
+            encoders = [_BINARY_ENCODERS[col_type] for col_type in column_types]
+            field_count = _INT2.pack(len(columns))
+            pack_length = _INT4.pack
+            
+            with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_MAX_SIZE, mode='w+b') as buffer:
+                buffer.write(_COPY_BINARY_HEADER)
+                for row in data:
+                    parts = [field_count]
+                    for encode, value in zip(encoders, row):
+                        if value is None:
+                            parts.append(_NULL_FIELD)
+                        else:
+                            encoded = encode(value)
+                            parts.append(pack_length(len(encoded)))
+                            parts.append(encoded)
+                    buffer.write(b''.join(parts))
+                buffer.write(_COPY_BINARY_TRAILER)
+                buffer.seek(0)
+                
+                with self.connection.cursor() as cursor:
+                    cursor.copy_expert(copy_sql, buffer)
+            
+            if commit:
+                self.connection.commit()
+            return True
+        except Exception as e:
+            logging.error(f"二进制COPY写入数据失败: {e}")
+            self.connection.rollback()
+            return False
+    
+    def get_column_types(self, table_name: str) -> Dict[str, str]:
+        """
+        获取表中各列的类型名称（不含长度修饰）
+        
+        查询在保存点中执行，失败时只回滚到保存点，不影响当前事务中尚未提交的数据。
+        
+        Args:
+            table_name: 表名
+            
+        Returns:
+            Dict[str, str]: 列名 -> 类型名称
+        """
+        if not self.connection:
+            return {}
+        
+        with self.connection.cursor() as cursor:
+            try:
+                cursor.execute("SAVEPOINT get_column_types")
+                cursor.execute("""
+                    SELECT a.attname, format_type(a.atttypid, NULL)
+                    FROM pg_attribute a
+                    WHERE a.attrelid = %s::regclass
+                    AND a.attnum > 0
+                    AND NOT a.attisdropped
+                """, (f'"{table_name}"',))
+                column_types = {row[0]: row[1] for row in cursor.fetchall()}
+                cursor.execute("RELEASE SAVEPOINT get_column_types")
+                return column_types
+            except Exception as e:
+                logging.error(f"获取列类型失败: {e}")
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT get_column_types")
+                except Exception:
+                    pass
+                return {}
+    
+    def insert_data_unnest(self, table_name: str, columns: List[str], data: List[Tuple],
+                           commit: bool = True, column_types: Optional[Dict[str, str]] = None) -> bool:
+        """
+        使用 UNNEST 数组参数插入数据
+        
+        每列只传一个数组参数，参数个数与行数无关，
+        不受单条语句 65535 个绑定参数的限制。用于 COPY 不可用时。
+        
+        Args:
+            table_name: 表名
+            columns: 列名列表
+            data: 数据列表
+            commit: 是否立即提交，为False时由调用方统一提交
+            column_types: 列名 -> 类型名称（get_column_types 的结果），分块插入同一张表时
+                由调用方查询一次后传入；未指定时在此查询
+            
+        Returns:
+            bool: 插入是否成功
+        """
+        if not self.connection or not data:
+            return False
+        
+        try:
+            if column_types is None:
+                column_types = self.get_column_types(table_name)
+            if not column_types:
+                return False
+            
+            # 行转列，每列一个数组
+            column_arrays = [list(values) for values in zip(*data)]
+            
+            column_names = ','.join([f'"{col}"' for col in columns])
+            arrays = ', '.join([f'%s::{column_types[col]}[]' for col in columns])
+            query = f'INSERT INTO "{table_name}" ({column_names}) SELECT * FROM UNNEST({arrays})'
+            
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, column_arrays)
+                if commit:
+                    self.connection.commit()
+                return True
+        except Exception as e:
+            logging.error(f"UNNEST插入数据失败: {e}")
+            self.connection.rollback()
+            return False
+    
+    def create_table(self, table_name: str, columns: List[Dict[str, Any]],
+                     include_primary_key: bool = True) -> bool:
         """
         创建表
         
         Args:
             table_name: 表名
             columns: 列定义列表
+            include_primary_key: 是否在建表时创建主键，批量导入时可在导入后再用 add_primary_key 创建
             
         Returns:
             bool: 创建是否成功
@@ -335,48 +604,50 @@ class PostgreSQLConnector(BaseConnector):
             # 删除表（如果存在）
             drop_sql = f'DROP TABLE IF EXISTS "{table_name}" CASCADE'
             
-            # 构建CREATE TABLE语句
+            # 构建CREATE TABLE语句（标识符和默认值由 psycopg2.sql 负责引用和转义）
             column_defs = []
             primary_keys = []
             
             for col in columns:
                 col_name = col['Field']
                 col_type = col['Type']
+                is_auto_increment = 'auto_increment' in col.get('Extra', '')
                 
                 # 处理 AUTO_INCREMENT -> SERIAL
-                if 'auto_increment' in col.get('Extra', ''):
+                if is_auto_increment:
                     if 'int' in col_type.lower():
                         col_type = 'SERIAL'
                     else:
                         col_type = 'BIGSERIAL'
                 
-                col_def = f'"{col_name}" {col_type}'
+                col_def = [sql.Identifier(col_name), sql.SQL(col_type)]
                 
                 # 处理 NULL/NOT NULL
-                if col['Null'] == 'NO' and 'auto_increment' not in col.get('Extra', ''):
-                    col_def += ' NOT NULL'
+                if col['Null'] == 'NO' and not is_auto_increment:
+                    col_def.append(sql.SQL('NOT NULL'))
                 
                 # 处理默认值
-                if col['Default'] is not None and 'auto_increment' not in col.get('Extra', ''):
+                if col['Default'] is not None and not is_auto_increment:
                     if col['Default'] == 'CURRENT_TIMESTAMP':
-                        col_def += ' DEFAULT CURRENT_TIMESTAMP'
+                        col_def.append(sql.SQL('DEFAULT CURRENT_TIMESTAMP'))
                     else:
-                        col_def += f" DEFAULT '{col['Default']}'"
+                        col_def.append(sql.SQL('DEFAULT {}').format(sql.Literal(str(col['Default']))))
                 
-                column_defs.append(col_def)
+                column_defs.append(sql.SQL('  ') + sql.SQL(' ').join(col_def))
                 
                 # 记录主键
                 if col['Key'] == 'PRI':
                     primary_keys.append(col_name)
             
-            create_sql = f'CREATE TABLE "{table_name}" (\n'
-            create_sql += ',\n'.join(f'  {col}' for col in column_defs)
-            
-            if primary_keys:
-                pk_list = ', '.join([f'"{pk}"' for pk in primary_keys])
-                create_sql += f',\n  PRIMARY KEY ({pk_list})'
+            if primary_keys and include_primary_key:
+                column_defs.append(sql.SQL('  PRIMARY KEY ({})').format(
+                    sql.SQL(', ').join(map(sql.Identifier, primary_keys))
+                ))
             
-            create_sql += '\n)'
+            create_sql = sql.SQL('CREATE TABLE {} (\n{}\n)').format(
+                sql.Identifier(table_name),
+                sql.SQL(',\n').join(column_defs)
+            )
             
             with self.connection.cursor() as cursor:
                 cursor.execute(drop_sql)
@@ -388,6 +659,95 @@ class PostgreSQLConnector(BaseConnector):
             self.connection.rollback()
             return False
 
+    def add_primary_key(self, table_name: str, primary_keys: List[str]) -> bool:
+        """
+        为已有数据的表添加主键
+        
+        Args:
+            table_name: 表名
+            primary_keys: 主键列名列表
+            
+        Returns:
+            bool: 添加是否成功
+        """
+        if not self.connection:
+            return False
+        if not primary_keys:
+            return True
+        
+        try:
+            pk_list = ', '.join([f'"{pk}"' for pk in primary_keys])
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{table_name}" ADD PRIMARY KEY ({pk_list})')
+                self.connection.commit()
+                return True
+        except Exception as e:
+            logging.error(f"添加主键失败: {e}")
+            self.connection.rollback()
+            return False
+    
+    def analyze_table(self, table_name: str) -> bool:
+        """
+        收集表的统计信息，批量导入后执行，使查询计划基于实际数据
+        
+        Args:
+            table_name: 表名
+            
+        Returns:
+            bool: 是否成功
+        """
+        if not self.connection:
+            return False
+        
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE "{table_name}"')
+                self.connection.commit()
+                return True
+        except Exception as e:
+            logging.warning(f"收集表统计信息失败: {e}")
+            self.connection.rollback()
+            return False
+    
+    def configure_bulk_load_session(self, maintenance_work_mem: str = '512MB',
+                                    parallel_maintenance_workers: int = 2) -> bool:
+        """
+        为批量导入调整当前会话参数
+        
+        关闭同步提交（崩溃时可能丢失最近提交的事务，但不会损坏数据），
+        增大建索引/主键时可用的内存，并允许建索引时使用并行工作进程。只影响当前连接。
+        
+        Args:
+            maintenance_work_mem: 建索引时使用的内存
+            parallel_maintenance_workers: 每次建索引最多使用的并行工作进程数（PostgreSQL 11+）
+            
+        Returns:
+            bool: 设置是否成功
+        """
+        if not self.connection:
+            return False
+        
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SET synchronous_commit = off")
+                cursor.execute("SET maintenance_work_mem = %s", (maintenance_work_mem,))
+                self.connection.commit()
+        except Exception as e:
+            logging.warning(f"设置批量导入会话参数失败: {e}")
+            self.connection.rollback()
+            return False
+        
+        # 旧版本没有该参数，设置失败不影响导入
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SET max_parallel_maintenance_workers = %s",
+                               (parallel_maintenance_workers,))
+                self.connection.commit()
+        except Exception as e:
+            logging.info(f"无法设置并行建索引参数: {e}")
+            self.connection.rollback()
+        return True
+    
     # 新增的抽象方法实现
     def get_table_info(self, table_name: str, schema: Optional[str] = None) -> TableInfo:
         """获取表的详细信息"""
@@ -610,10 +970,44 @@ class PostgreSQLConnector(BaseConnector):
             logging.error(f"删除表失败: {e}")
             self.connection.rollback()
 
-    def begin_transaction(self) -> None:
-        """开始事务"""
+    def truncate_table(self, table_name: str, commit: bool = True) -> bool:
+        """
+        清空表数据
+        
+        Args:
+            table_name: 表名
+            commit: 是否立即提交，为False时由调用方统一提交
+                    （在同一事务中执行后续 COPY 可以使用 FREEZE 选项）
+            
+        Returns:
+            bool: 是否成功
+        """
+        if not self.connection:
+            return False
+        
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE TABLE "{table_name}"')
+            if commit:
+                self.connection.commit()
+            return True
+        except Exception as e:
+            logging.error(f"清空表失败: {e}")
+            self.connection.rollback()
+            return False
+
+    def begin_transaction(self, synchronous_commit: bool = True) -> None:
+        """
+        开始事务
+        
+        Args:
+            synchronous_commit: 为False时本事务提交不等待WAL刷盘（SET LOCAL，仅对本事务有效）
+        """
         if self.connection:
             self.connection.autocommit = False
+            if not synchronous_commit:
+                with self.connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL synchronous_commit = off")
 
     def commit_transaction(self) -> None:
         """提交事务"""
@@ -664,13 +1058,16 @@ class PostgreSQLConnector(BaseConnector):
             logging.warning(f"获取主键信息失败: {e}")
     
     def test_connection(self) -> bool:
-        """测试数据库连接"""
+        """测试数据库连接（已有连接时直接在该连接上测试，并保持连接）"""
         try:
+            was_connected = self.is_connected()
             if self.connect():
                 with self.connection.cursor() as cursor:
                     cursor.execute("SELECT 1")
                     cursor.fetchone()
-                self.disconnect()
+                self.connection.rollback()
+                if not was_connected:
+                    self.disconnect()
                 return True
         except Exception as e:
             logging.error(f"连接测试失败: {e}")
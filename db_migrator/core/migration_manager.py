@@ -5,7 +5,13 @@ Migration Manager - 统一的迁移管理器
 
 import logging
 from typing import Dict, List, Any, Optional
-from ..migrators.mysql_to_postgresql import MySQLToPostgreSQLMigrator
+from ..migrators.mysql_to_postgresql import (
+    MySQLToPostgreSQLMigrator,
+    DEFAULT_COMMIT_ROWS,
+    DEFAULT_COPY_ROWS,
+    DEFAULT_FETCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+)
 
 
 class MigrationManager:
@@ -89,14 +95,20 @@ class MigrationManager:
         try:
             # 获取迁移选项
             tables = self.options.get('tables')
-            batch_size = self.options.get('batch_size', 1000)
+            batch_size = self.options.get('batch_size', DEFAULT_FETCH_SIZE)
             include_indexes = self.options.get('migrate_indexes', True)
+            max_workers = self.options.get('workers', DEFAULT_MAX_WORKERS)
+            copy_rows = self.options.get('copy_rows', DEFAULT_COPY_ROWS)
+            commit_rows = self.options.get('commit_rows', DEFAULT_COMMIT_ROWS)
             
             # 执行迁移
             return self.migrator.migrate(
                 tables=tables,
                 batch_size=batch_size,
-                include_indexes=include_indexes
+                include_indexes=include_indexes,
+                max_workers=max_workers,
+                copy_rows=copy_rows,
+                commit_rows=commit_rows
             )
             
         except Exception as e:
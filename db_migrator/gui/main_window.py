@@ -13,6 +13,7 @@ import logging
 import tkinter.ttk as ttk
 import re
 import time
+import datetime
 
 try:
     import customtkinter as ctk
@@ -20,9 +21,49 @@ try:
 except ImportError:
     CUSTOM_TK_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from ..migrators.mysql_to_postgresql import MySQLToPostgreSQLMigrator
 
 
+# 日志区域最多保留的行数，超出后裁剪到 _LOG_TRIM_TO 行
+MAX_LOG_LINES = 5000
+_LOG_TRIM_TO = 4000
+
+# 需要跳过的重复日志（旧式的简单进度消息）
+_SKIP_RE = re.compile(r"^  已迁移: \w+$")
+
+# 日志前缀 -> 图标，按前缀匹配
+_LOG_PREFIX_ICONS = (
+    ("开始迁移", "🚀"),
+    ("迁移完成", "🎉"),
+)
+
+# 需要去除首尾空白的状态前缀 -> 图标
+_LOG_STATUS_ICONS = {
+    "  ✓": "✅",
+    "  ✗": "❌",
+}
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any], compact: bool = False):
+    """先写临时文件再原子替换，避免写入中途崩溃导致配置文件损坏"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if compact:
+            # 内部使用的文件不需要缩进
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        else:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
 class MigratorGUI:
     """数据库迁移工具图形界面"""
     
@@ -55,10 +96,25 @@ class MigratorGUI:
         # 表选择状态管理
         self.all_tables_data = []
         self.selected_table_names = set()  # 独立维护选择状态
+        self._filter_cache = {}  # 过滤条件 -> 匹配的表名顺序
+        self._tree_items = []  # Treeview中已插入的全部表（含被过滤隐藏的）
+        self._rows_arr = None  # 行数数组（NumPy可用时）
+        self._size_arr = None  # 估算大小数组（NumPy可用时）
+        self._rows_by_name = {}  # 表名 -> 行数
+        self._selected_rows_total = 0  # 选中表的总行数（增量维护）
+        
+        # 连接配置快照，表单修改时才重建
+        self._cfg_dirty = True
+        self._mysql_cached: Optional[Dict[str, Any]] = None
+        self._pg_cached: Optional[Dict[str, Any]] = None
         
         # 创建界面
         self.create_widgets()
         
+        # 任一连接字段被修改都让快照失效
+        for var in list(self.mysql_vars.values()) + list(self.pg_vars.values()):
+            var.trace_add('write', self._mark_config_dirty)
+        
         # 加载保存的配置
         self.load_config()
     
@@ -293,7 +349,7 @@ class MigratorGUI:
             batch_frame.pack(fill="x", padx=10, pady=(10, 5))
             
             ctk.CTkLabel(batch_frame, text="批处理大小:").pack(side="left", padx=(10, 5))
-            self.batch_size_var = tk.StringVar(value="1000")
+            self.batch_size_var = tk.StringVar(value="10000")
             batch_entry = ctk.CTkEntry(batch_frame, textvariable=self.batch_size_var, width=80)
             batch_entry.pack(side="left", padx=5)
             
@@ -337,7 +393,7 @@ class MigratorGUI:
             batch_frame = ttk.Frame(options_frame)
             batch_frame.pack(fill="x", pady=(0, 5))
             ttk.Label(batch_frame, text="批处理大小:").pack(side="left")
-            self.batch_size_var = tk.StringVar(value="1000")
+            self.batch_size_var = tk.StringVar(value="10000")
             ttk.Entry(batch_frame, textvariable=self.batch_size_var, width=10).pack(side="left", padx=(5, 10))
             
             # 第二行：复选框选项
@@ -513,11 +569,25 @@ class MigratorGUI:
         
         # 日志文本区域
         if self.use_custom_tk:
-            self.log_text = tk.Text(log_frame, wrap=tk.WORD, state=tk.DISABLED)
+            self.log_text = tk.Text(log_frame, wrap=tk.WORD)
             self.log_text.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         else:
-            self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, state=tk.DISABLED)
+            self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD)
             self.log_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        
+        # 日志区域保持可写状态，通过拦截编辑事件实现只读，
+        # 避免每写一行日志都来回切换 state
+        self.log_text.bind('<Key>', self._block_log_edit)
+        for sequence in ('<<Paste>>', '<<PasteSelection>>', '<<Cut>>', '<<Clear>>'):
+            self.log_text.bind(sequence, lambda e: 'break')
+    
+    def _block_log_edit(self, event):
+        """拦截日志区域的键盘编辑，保留复制和光标移动"""
+        if event.keysym in ('c', 'C', 'a', 'A') and event.state & 0x4:
+            return None
+        if event.keysym in ('Left', 'Right', 'Up', 'Down', 'Home', 'End', 'Prior', 'Next'):
+            return None
+        return 'break'
     
     def create_control_buttons(self, parent):
         """创建控制按钮"""
@@ -560,25 +630,41 @@ class MigratorGUI:
             self.preview_btn = ttk.Button(button_frame, text="预览迁移", command=self.preview_migration)
             self.preview_btn.pack(side="left", padx=5)
     
-    def get_mysql_config(self) -> Dict[str, Any]:
-        """获取MySQL配置"""
-        return {
+    def _mark_config_dirty(self, *args):
+        """连接字段变化时标记配置快照失效"""
+        self._cfg_dirty = True
+    
+    def _refresh_config_snapshot(self):
+        """表单有修改时重新读取连接配置"""
+        if not self._cfg_dirty:
+            return
+        mysql_config = {
             'host': self.mysql_vars['host'].get(),
             'port': int(self.mysql_vars['port'].get() or 3306),
             'username': self.mysql_vars['username'].get(),
             'password': self.mysql_vars['password'].get(),
             'database': self.mysql_vars['database'].get()
         }
-    
-    def get_pg_config(self) -> Dict[str, Any]:
-        """获取PostgreSQL配置"""
-        return {
+        pg_config = {
             'host': self.pg_vars['host'].get(),
             'port': int(self.pg_vars['port'].get() or 5432),
             'username': self.pg_vars['username'].get(),
             'password': self.pg_vars['password'].get(),
             'database': self.pg_vars['database'].get()
         }
+        self._mysql_cached = mysql_config
+        self._pg_cached = pg_config
+        self._cfg_dirty = False
+    
+    def get_mysql_config(self) -> Dict[str, Any]:
+        """获取MySQL配置"""
+        self._refresh_config_snapshot()
+        return dict(self._mysql_cached)
+    
+    def get_pg_config(self) -> Dict[str, Any]:
+        """获取PostgreSQL配置"""
+        self._refresh_config_snapshot()
+        return dict(self._pg_cached)
     
     def test_connections(self):
         """测试数据库连接"""
@@ -691,8 +777,21 @@ class MigratorGUI:
         finally:
             self.update_progress("准备就绪")
 
+    def _build_stats_arrays(self):
+        """将表行数和大小转换为NumPy数组，供统计时向量化计算"""
+        if not NUMPY_AVAILABLE:
+            return
+        count = len(self.all_tables_data)
+        self._rows_arr = np.fromiter((t['rows'] for t in self.all_tables_data),
+                                     dtype=np.int64, count=count)
+        self._size_arr = np.fromiter((t['size_mb'] for t in self.all_tables_data),
+                                     dtype=np.float64, count=count)
+
     def populate_table_list(self):
         """填充表列表显示"""
+        self._build_stats_arrays()
+        self._rows_by_name = {t['name']: t['rows'] for t in self.all_tables_data}
+        
         if self.use_custom_tk:
             # 简化版本：使用Listbox
             self.table_listbox.delete(0, tk.END)
@@ -701,17 +800,21 @@ class MigratorGUI:
                 self.table_listbox.insert(tk.END, display_text)
         else:
             # 增强版本：使用Treeview
-            # 清空现有项目
-            for item in self.table_tree.get_children():
-                self.table_tree.delete(item)
+            # 表数据已变化，过滤缓存失效
+            self._filter_cache.clear()
             
-            # 添加表数据
+            # 清空现有项目（包括被过滤隐藏的项目）
+            self.table_tree.delete(*[iid for iid in self._tree_items if self.table_tree.exists(iid)])
+            self.table_tree.delete(*self.table_tree.get_children())
+            
+            # 添加表数据（以表名作为iid，避免反复读取values）
             for table_info in self.all_tables_data:
-                self.table_tree.insert('', 'end', text='☐',
+                self.table_tree.insert('', 'end', iid=table_info['name'], text='☐',
                     values=(table_info['name'], 
                            f"{table_info['rows']:,}",
                            table_info['size'],
                            table_info['columns']))
+            self._tree_items = [table_info['name'] for table_info in self.all_tables_data]
 
     def filter_tables(self, event=None):
         """过滤表列表"""
@@ -721,11 +824,14 @@ class MigratorGUI:
         search_text = self.search_var.get().lower()
         show_filter = self.show_filter_var.get()
         
-        # 清空现有显示
-        for item in self.table_tree.get_children():
-            self.table_tree.delete(item)
+        self._apply_filter(search_text, show_filter)
         
-        # 过滤并显示表
+        self.update_selection_marks()
+        self.update_table_status()
+
+    def _match_filter(self, search_text: str, show_filter: str):
+        """计算满足过滤条件的表名（按原顺序）"""
+        visible = []
         for table_info in self.all_tables_data:
             table_name = table_info['name']
             is_selected = table_name in self.selected_table_names
@@ -746,15 +852,31 @@ class MigratorGUI:
             elif show_filter == "empty" and table_info['rows'] > 0:
                 continue
             
-            # 添加表项
-            item_id = self.table_tree.insert('', 'end', text='☐',
-                   values=(table_info['name'], 
-                          f"{table_info['rows']:,}",
-                          table_info['size'],
-                          table_info['columns']))
+            visible.append(table_name)
+        return tuple(visible)
+
+    def _apply_filter(self, search_text: str, show_filter: str):
+        """应用过滤条件，结果不变时不触碰Treeview"""
+        # 选中/未选中过滤依赖当前选择状态，不能缓存
+        key = (search_text, show_filter)
+        cacheable = show_filter not in ("selected", "unselected")
+        visible = self._filter_cache.get(key) if cacheable else None
+        if visible is None:
+            visible = self._match_filter(search_text, show_filter)
+            if cacheable:
+                self._filter_cache[key] = visible
+        
+        current = self.table_tree.get_children()
+        if current == visible:
+            return
         
-        self.update_selection_marks()
-        self.update_table_status()
+        # 隐藏不匹配的项目，按顺序重新挂回匹配的项目（无需重新插入）
+        visible_set = set(visible)
+        hidden = [iid for iid in current if iid not in visible_set]
+        if hidden:
+            self.table_tree.detach(*hidden)
+        for index, iid in enumerate(visible):
+            self.table_tree.move(iid, '', index)
 
     def get_selected_tables(self):
         """获取选中的表"""
@@ -777,9 +899,7 @@ class MigratorGUI:
         else:
             # 选择所有显示的表
             self.selected_table_names.clear()
-            for item in self.table_tree.get_children():
-                table_name = self.table_tree.item(item)['values'][0]
-                self.selected_table_names.add(table_name)
+            self.selected_table_names.update(self.table_tree.get_children())
             
             self.update_selection_marks()
             self.update_table_status()
@@ -799,15 +919,17 @@ class MigratorGUI:
         if self.use_custom_tk:
             return
         
-        total_tables = len(self.all_tables_data)
-        selected_tables = self.get_selected_tables()
-        selected_count = len(selected_tables)
+        # 重新计算选中表的总行数
+        rows_by_name = self._rows_by_name
+        self._selected_rows_total = sum(rows_by_name.get(name, 0) for name in self.selected_table_names)
         
-        # 计算选中表的总行数
-        total_rows = 0
-        for table_info in self.all_tables_data:
-            if table_info['name'] in selected_tables:
-                total_rows += table_info['rows']
+        self._update_status_label()
+
+    def _update_status_label(self):
+        """根据当前计数刷新状态栏文字"""
+        total_tables = len(self.all_tables_data)
+        selected_count = len(self.selected_table_names)
+        total_rows = self._selected_rows_total
         
         status_text = f"📋 表: {total_tables} | 选中: {selected_count} | 选中表行数: {total_rows:,}"
         self.table_status_label.configure(text=status_text)
@@ -847,8 +969,14 @@ class MigratorGUI:
         preview_listbox.pack(side="left", fill="both", expand=True)
         preview_scroll.pack(side="right", fill="y")
         
+        self._last_pattern = ''
+        
         def update_preview(*args):
             pattern = pattern_var.get()
+            # 内容未变化（例如程序重复设置同一值）时不重新扫描
+            if pattern == self._last_pattern:
+                return
+            self._last_pattern = pattern
             preview_listbox.delete(0, tk.END)
             
             if pattern:
@@ -862,7 +990,7 @@ class MigratorGUI:
                 if matched_tables:
                     preview_listbox.insert(0, f"--- 匹配到 {len(matched_tables)} 个表 ---")
         
-        pattern_var.trace('w', update_preview)
+        pattern_var.trace_add('write', update_preview)
         
         # 按钮
         button_frame = ttk.Frame(dialog)
@@ -896,14 +1024,33 @@ class MigratorGUI:
         
         # 计算统计信息
         total_tables = len(self.all_tables_data)
-        total_rows = sum(table['rows'] for table in self.all_tables_data)
-        total_size_mb = sum(table['size_mb'] for table in self.all_tables_data)
-        
-        # 找出最大的表
-        largest_table = max(self.all_tables_data, key=lambda x: x['rows']) if self.all_tables_data else None
-        
-        # 统计空表
-        empty_tables = [table for table in self.all_tables_data if table['rows'] == 0]
+        if self._rows_arr is not None and len(self._rows_arr) == total_tables:
+            # NumPy向量化统计
+            total_rows = int(self._rows_arr.sum())
+            total_size_mb = float(self._size_arr.sum())
+            largest_table = self.all_tables_data[int(self._rows_arr.argmax())]
+            empty_indexes = np.flatnonzero(self._rows_arr == 0)
+            empty_count = len(empty_indexes)
+            empty_sample = [self.all_tables_data[i]['name'] for i in empty_indexes[:5]]
+        else:
+            # 单次遍历同时统计总量、最大表和空表
+            total_rows = 0
+            total_size_mb = 0
+            largest_table = None
+            largest_rows = -1
+            empty_count = 0
+            empty_sample = []
+            for table in self.all_tables_data:
+                rows = table['rows']
+                total_rows += rows
+                total_size_mb += table['size_mb']
+                if rows > largest_rows:
+                    largest_rows = rows
+                    largest_table = table
+                if rows == 0:
+                    empty_count += 1
+                    if len(empty_sample) < 5:
+                        empty_sample.append(table['name'])
         
         message = f"📊 数据库统计信息\n\n"
         message += f"总表数: {total_tables}\n"
@@ -915,12 +1062,12 @@ class MigratorGUI:
             message += f"  行数: {largest_table['rows']:,}\n"
             message += f"  列数: {largest_table['columns']}\n\n"
         
-        if empty_tables:
-            message += f"空表数量: {len(empty_tables)}\n"
-            if len(empty_tables) <= 5:
-                message += f"空表: {', '.join([t['name'] for t in empty_tables])}\n"
+        if empty_count:
+            message += f"空表数量: {empty_count}\n"
+            if empty_count <= 5:
+                message += f"空表: {', '.join(empty_sample)}\n"
             else:
-                message += f"空表: {', '.join([t['name'] for t in empty_tables[:5]])} 等\n"
+                message += f"空表: {', '.join(empty_sample)} 等\n"
         
         messagebox.showinfo("表统计信息", message)
 
@@ -933,8 +1080,7 @@ class MigratorGUI:
         if not selection:
             return
         
-        item = selection[0]
-        table_name = self.table_tree.item(item)['values'][0]
+        table_name = selection[0]
         
         # 找到表信息
         table_info = None
@@ -1038,9 +1184,7 @@ class MigratorGUI:
                 selected_tables = None
             
             # 清空日志
-            self.log_text.configure(state=tk.NORMAL)
             self.log_text.delete(1.0, tk.END)
-            self.log_text.configure(state=tk.DISABLED)
             
             # 创建迁移器
             self.migrator = MySQLToPostgreSQLMigrator(
@@ -1054,7 +1198,7 @@ class MigratorGUI:
             try:
                 batch_size = int(self.batch_size_var.get())
             except ValueError:
-                batch_size = 1000
+                batch_size = 10000
             
             # 开始迁移线程
             self.is_migrating = True
@@ -1156,12 +1300,16 @@ class MigratorGUI:
         except Exception as e:
             messagebox.showerror("错误", f"获取预览信息时发生错误:\n{str(e)}")
     
+    def _snapshot_vars(self, mapping: Dict[str, Any], mask=()) -> Dict[str, Any]:
+        """一次性读取界面变量的值，mask 中的字段置空"""
+        return {k: ("" if k in mask else v.get()) for k, v in mapping.items()}
+    
     def save_config(self):
         """保存配置"""
         try:
             config = {
-                'mysql': {var: val.get() for var, val in self.mysql_vars.items()},
-                'postgresql': {var: val.get() for var, val in self.pg_vars.items()},
+                'mysql': self._snapshot_vars(self.mysql_vars),
+                'postgresql': self._snapshot_vars(self.pg_vars),
                 'options': {
                     'batch_size': self.batch_size_var.get(),
                     'include_indexes': self.include_indexes_var.get(),
@@ -1176,13 +1324,24 @@ class MigratorGUI:
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
-                messagebox.showinfo("保存成功", f"配置已保存到: {filename}")
+                # 文件写入放到后台线程，完成后回到主线程提示
+                threading.Thread(
+                    target=self._save_config_worker,
+                    args=(filename, config),
+                    daemon=True
+                ).start()
             
         except Exception as e:
             messagebox.showerror("错误", f"保存配置时发生错误:\n{str(e)}")
     
+    def _save_config_worker(self, filename: str, config: Dict[str, Any]):
+        """保存配置（在后台线程中）"""
+        try:
+            _write_json_atomic(filename, config)
+            self.root.after(0, messagebox.showinfo, "保存成功", f"配置已保存到: {filename}")
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "错误", f"保存配置时发生错误:\n{str(e)}")
+    
     def load_config_file(self):
         """加载配置文件"""
         try:
@@ -1191,38 +1350,57 @@ class MigratorGUI:
             )
             
             if filename:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                
-                # 加载MySQL配置
-                if 'mysql' in config:
-                    for var, val in config['mysql'].items():
-                        if var in self.mysql_vars:
-                            self.mysql_vars[var].set(val)
-                
-                # 加载PostgreSQL配置
-                if 'postgresql' in config:
-                    for var, val in config['postgresql'].items():
-                        if var in self.pg_vars:
-                            self.pg_vars[var].set(val)
-                
-                # 加载选项
-                if 'options' in config:
-                    options = config['options']
-                    if 'batch_size' in options:
-                        self.batch_size_var.set(options['batch_size'])
-                    if 'include_indexes' in options:
-                        self.include_indexes_var.set(options['include_indexes'])
-                    if 'drop_existing' in options:
-                        self.drop_existing_var.set(options['drop_existing'])
-                    if 'auto_convert_tinyint_to_bool' in options:
-                        self.auto_convert_tinyint_var.set(options['auto_convert_tinyint_to_bool'])
-                
-                messagebox.showinfo("加载成功", f"配置已从 {filename} 加载")
+                # 文件读取放到后台线程，解析结果回到主线程应用
+                threading.Thread(
+                    target=self._load_config_worker,
+                    args=(filename,),
+                    daemon=True
+                ).start()
             
         except Exception as e:
             messagebox.showerror("错误", f"加载配置时发生错误:\n{str(e)}")
     
+    def _load_config_worker(self, filename: str):
+        """读取配置文件（在后台线程中）"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            self.root.after(0, self._apply_config, filename, config)
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "错误", f"加载配置时发生错误:\n{str(e)}")
+    
+    def _apply_config(self, filename: str, config: Dict[str, Any]):
+        """将读取到的配置应用到界面"""
+        try:
+            # 加载MySQL配置
+            if 'mysql' in config:
+                for var, val in config['mysql'].items():
+                    if var in self.mysql_vars:
+                        self.mysql_vars[var].set(val)
+            
+            # 加载PostgreSQL配置
+            if 'postgresql' in config:
+                for var, val in config['postgresql'].items():
+                    if var in self.pg_vars:
+                        self.pg_vars[var].set(val)
+            
+            # 加载选项
+            if 'options' in config:
+                options = config['options']
+                if 'batch_size' in options:
+                    self.batch_size_var.set(options['batch_size'])
+                if 'include_indexes' in options:
+                    self.include_indexes_var.set(options['include_indexes'])
+                if 'drop_existing' in options:
+                    self.drop_existing_var.set(options['drop_existing'])
+                if 'auto_convert_tinyint_to_bool' in options:
+                    self.auto_convert_tinyint_var.set(options['auto_convert_tinyint_to_bool'])
+            
+            messagebox.showinfo("加载成功", f"配置已从 {filename} 加载")
+        
+        except Exception as e:
+            messagebox.showerror("错误", f"加载配置时发生错误:\n{str(e)}")
+    
     def load_config(self):
         """加载默认配置"""
         config_file = os.path.join(os.path.expanduser("~"), ".db_migrator_config.json")
@@ -1265,48 +1443,44 @@ class MigratorGUI:
         
         if display_message:  # 只显示非空消息
             # 添加到日志
-            self.log_text.configure(state=tk.NORMAL)
             self.log_text.insert(tk.END, display_message + "\n")
+            
+            # 限制日志行数，避免长时间迁移后文本控件越来越慢
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                self.log_text.delete('1.0', f'end-{_LOG_TRIM_TO} lines')
+            
             self.log_text.see(tk.END)
-            self.log_text.configure(state=tk.DISABLED)
     
     def _format_log_message(self, message: str, current: int = 0, total: int = 0):
         """格式化日志消息，过滤重复和无用信息"""
         # 跳过某些重复的消息
-        skip_patterns = [
-            r"^  已迁移: \w+$",  # 跳过旧式的简单进度消息
-            r"^  已迁移: channels$",  # 跳过重复的channels消息
-        ]
-        
-        for pattern in skip_patterns:
-            if re.match(pattern, message):
-                return None
+        if _SKIP_RE.match(message):
+            return None
         
         # 格式化时间戳
-        import datetime
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         
         # 为不同类型的消息添加不同的格式
-        if message.startswith("开始迁移"):
-            return f"[{timestamp}] 🚀 {message}"
-        elif "处理表:" in message:
-            return f"[{timestamp}] 📋 {message}"
-        elif message.startswith("  ✓"):
-            return f"[{timestamp}] ✅ {message.strip()}"
-        elif message.startswith("  ✗"):
-            return f"[{timestamp}] ❌ {message.strip()}"
-        elif message.startswith("  ⏳"):
+        status_icon = _LOG_STATUS_ICONS.get(message[:3])
+        if status_icon:
+            return f"[{timestamp}] {status_icon} {message.strip()}"
+        
+        if message.startswith("  ⏳"):
             # 进度消息，添加进度条
             if current > 0 and total > 0:
-                percent = (current / total) * 100
                 bar_length = 20
                 filled_length = int(bar_length * current // total)
                 bar = '█' * filled_length + '░' * (bar_length - filled_length)
                 return f"[{timestamp}] {message.strip()} [{bar}]"
-            else:
-                return f"[{timestamp}] {message.strip()}"
-        elif message.startswith("迁移完成"):
-            return f"[{timestamp}] 🎉 {message}"
+            return f"[{timestamp}] {message.strip()}"
+        
+        for prefix, icon in _LOG_PREFIX_ICONS:
+            if message.startswith(prefix):
+                return f"[{timestamp}] {icon} {message}"
+        
+        if "处理表:" in message:
+            return f"[{timestamp}] 📋 {message}"
         elif "错误" in message or "失败" in message:
             return f"[{timestamp}] ⚠️ {message}"
         else:
@@ -1317,28 +1491,27 @@ class MigratorGUI:
         if self.use_custom_tk:
             return
         
-        # 获取点击的项目
-        item = self.table_tree.identify_row(event.y)
-        if not item:
-            return
-        
-        # 获取表名
-        values = self.table_tree.item(item)['values']
-        if not values:
+        # 获取点击的项目（iid即表名）
+        table_name = self.table_tree.identify_row(event.y)
+        if not table_name:
             return
-        table_name = values[0]
         
-        # 切换选择状态
-        if table_name in self.selected_table_names:
+        # 切换选择状态，只更新被点击的行和计数
+        selected = self.selected_table_names
+        if table_name in selected:
             # 取消选择
-            self.selected_table_names.discard(table_name)
+            selected.discard(table_name)
+            self._selected_rows_total -= self._rows_by_name.get(table_name, 0)
+            mark = '☐'
         else:
             # 添加选择
-            self.selected_table_names.add(table_name)
+            selected.add(table_name)
+            self._selected_rows_total += self._rows_by_name.get(table_name, 0)
+            mark = '☑'
         
         # 更新显示
-        self.update_selection_marks()
-        self.update_table_status()
+        self.table_tree.item(table_name, text=mark)
+        self._update_status_label()
         
         # 阻止默认的Treeview选择行为
         return "break"
@@ -1349,10 +1522,9 @@ class MigratorGUI:
             return
         
         # 更新所有项目的选择标记
-        for item in self.table_tree.get_children():
-            table_name = self.table_tree.item(item)['values'][0]
+        for table_name in self.table_tree.get_children():
             check_mark = '☑' if table_name in self.selected_table_names else '☐'
-            self.table_tree.item(item, text=check_mark)
+            self.table_tree.item(table_name, text=check_mark)
 
     def run(self):
         """运行GUI"""
@@ -1360,15 +1532,22 @@ class MigratorGUI:
         def on_closing():
             try:
                 config = {
-                    'mysql': {var: val.get() if var != 'password' else '' 
-                             for var, val in self.mysql_vars.items()},
-                    'postgresql': {var: val.get() if var != 'password' else '' 
-                                  for var, val in self.pg_vars.items()}
+                    'mysql': self._snapshot_vars(self.mysql_vars, mask=('password',)),
+                    'postgresql': self._snapshot_vars(self.pg_vars, mask=('password',))
                 }
                 
                 config_file = os.path.join(os.path.expanduser("~"), ".db_migrator_config.json")
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
+                
+                # 后台写入，最多等待1秒，避免关闭窗口时界面卡顿
+                def write_config():
+                    try:
+                        _write_json_atomic(config_file, config, compact=True)
+                    except Exception:
+                        pass  # 忽略保存错误
+                
+                writer = threading.Thread(target=write_config, daemon=True)
+                writer.start()
+                writer.join(timeout=1.0)
             except Exception:
                 pass  # 忽略保存错误
             
@@ -5,14 +5,169 @@ MySQL to PostgreSQL Migration Script
 """
 
 import logging
+import queue
 import re
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Callable, Optional
 from ..connectors.mysql_connector import MySQLConnector
 from ..connectors.postgresql_connector import PostgreSQLConnector
 from ..core.type_mapper import TypeMapper
 
 
+# 迁移过程中最多保留的错误信息条数（只保留最近的）
+MAX_RECORDED_ERRORS = 1000
+
+# 读写流水线中缓冲的批次数量，限制内存占用
+PIPELINE_QUEUE_SIZE = 2
+
+# 默认同时迁移的表数量（按表并行，同一张表内不并行写入）
+DEFAULT_MAX_WORKERS = 4
+
+# 每次从MySQL读取的行数
+DEFAULT_FETCH_SIZE = 10000
+
+# 每次COPY写入的行数
+DEFAULT_COPY_ROWS = 50000
+
+# 每写入多少行提交一次事务
+DEFAULT_COMMIT_ROWS = 500000
+
+# 预估迁移耗时使用的处理速度（行/秒）
+ESTIMATED_ROWS_PER_SECOND = 20000
+
+# 数据迁移进度的最短报告间隔（秒）
+PROGRESS_REPORT_INTERVAL = 0.5
+
+# 每次 COPY 写入的目标耗时（秒），写入行数在 [batch_size, copy_rows] 范围内按实际耗时调整
+COPY_TARGET_SECONDS = 1.0
+
+# 类型长度/精度，如 varchar(255) 中的 255
+_LEN_RE = re.compile(r'\(([^)]+)\)')
+
+# 类型修饰符 unsigned/signed/zerofill
+_MOD_RE = re.compile(r'\s+(unsigned|signed|zerofill)')
+
+# 序列默认值中的序列名，如 nextval('users_id_seq'::regclass)
+_SEQ_NAME_RE = re.compile(r"'([^']+)'")
+
+
+def _quote_identifier(name: str) -> str:
+    """引用 PostgreSQL 标识符（双引号转义）"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quote_mysql_identifier(name: str) -> str:
+    """引用 MySQL 标识符（反引号转义）"""
+    return '`' + name.replace('`', '``') + '`'
+
+
+def _quote_literal(value: Any) -> str:
+    """引用 PostgreSQL 字符串常量（单引号转义，含反斜杠时使用 E'' 语法）"""
+    text = str(value).replace("'", "''")
+    if '\\' in text:
+        return "E'" + text.replace('\\', '\\\\') + "'"
+    return "'" + text + "'"
+
+
+# 类型映射
+_TYPE_MAPPING = {
+    'int': 'INTEGER',
+    'tinyint': 'SMALLINT',
+    'smallint': 'SMALLINT',
+    'mediumint': 'INTEGER',
+    'bigint': 'BIGINT',
+    'float': 'REAL',
+    'double': 'DOUBLE PRECISION',
+    'decimal': 'DECIMAL',
+    'varchar': 'VARCHAR',
+    'char': 'CHAR',
+    'text': 'TEXT',
+    'tinytext': 'TEXT',
+    'mediumtext': 'TEXT',
+    'longtext': 'TEXT',
+    'datetime': 'TIMESTAMP',
+    'timestamp': 'TIMESTAMP',
+    'date': 'DATE',
+    'time': 'TIME',
+    'json': 'JSON',
+    'enum': 'VARCHAR(255)',
+    'blob': 'BYTEA',
+    'tinyblob': 'BYTEA',
+    'mediumblob': 'BYTEA',
+    'longblob': 'BYTEA',
+}
+
+
+@lru_cache(maxsize=1024)
+def _convert_column_type(mysql_type: str, auto_convert_tinyint_to_bool: bool) -> str:
+    """转换 MySQL 数据类型到 PostgreSQL（纯函数，结果可缓存）"""
+    type_lower = mysql_type.lower()
+    
+    # 提取基本类型
+    has_length = '(' in type_lower
+    base_type = type_lower.split('(')[0] if has_length else type_lower
+    
+    # 检查是否是 unsigned
+    is_unsigned = 'unsigned' in type_lower
+    
+    # 移除 unsigned 等修饰符，只保留基本类型名称
+    if ' ' in base_type:
+        base_type = _MOD_RE.sub('', base_type)
+    base_type = base_type.strip()
+    
+    # 获取长度/精度（没有括号的类型不需要正则匹配）
+    length_match = _LEN_RE.search(mysql_type) if has_length else None
+    length = length_match.group(1) if length_match else None
+    
+    # 特殊处理 tinyint 类型
+    if base_type == 'tinyint':
+        # tinyint(1) 通常用作布尔值
+        if length == '1':
+            return 'BOOLEAN'
+        elif length is None and auto_convert_tinyint_to_bool and not is_unsigned:
+            # 没有长度的tinyint，根据配置选择是否转换为布尔值
+            # 但无符号tinyint不转换为布尔值，因为它们通常用作小整数
+            return 'BOOLEAN'
+        else:
+            # 其他 tinyint 作为小整数
+            return 'SMALLINT'
+    
+    # 转换其他类型
+    pg_type = _TYPE_MAPPING.get(base_type, 'TEXT')
+    
+    # 处理特殊情况
+    if base_type in ['varchar', 'char'] and length:
+        pg_type = f"{pg_type}({length})"
+    elif base_type == 'decimal' and length:
+        pg_type = f"{pg_type}({length})"
+    elif base_type == 'int' and is_unsigned:
+        pg_type = 'BIGINT'  # unsigned int 需要更大的类型
+    elif base_type == 'bigint' and is_unsigned:
+        # unsigned bigint 在 PostgreSQL 中仍然使用 BIGINT，但需要注意数据范围
+        # MySQL的 unsigned bigint 范围是 0 到 18446744073709551615
+        # PostgreSQL的 bigint 范围是 -9223372036854775808 到 9223372036854775807
+        # 对于超出范围的值，可能需要使用 NUMERIC 类型，但这里保持 BIGINT 以保持性能
+        pg_type = 'BIGINT'
+    elif base_type == 'smallint' and is_unsigned:
+        # unsigned smallint 可以用 integer 来存储
+        pg_type = 'INTEGER'
+    elif base_type == 'mediumint' and is_unsigned:
+        # unsigned mediumint 可以用 integer 来存储
+        pg_type = 'INTEGER'
+    
+    return pg_type
+
+
+def _to_bytea_hex(value) -> str:
+    """二进制数据转换为 bytea 的十六进制输入格式"""
+    return '\\x' + bytes(value).hex()
+
+
 class MySQLToPostgreSQLMigrator:
     """MySQL到PostgreSQL数据库迁移器"""
     
@@ -41,33 +196,15 @@ class MySQLToPostgreSQLMigrator:
         # 进度回调函数
         self.progress_callback: Optional[Callable[[str, int, int], None]] = None
         
-        # 类型映射
-        self.type_mapping = {
-            'int': 'INTEGER',
-            'tinyint': 'SMALLINT',
-            'smallint': 'SMALLINT',
-            'mediumint': 'INTEGER',
-            'bigint': 'BIGINT',
-            'float': 'REAL',
-            'double': 'DOUBLE PRECISION',
-            'decimal': 'DECIMAL',
-            'varchar': 'VARCHAR',
-            'char': 'CHAR',
-            'text': 'TEXT',
-            'tinytext': 'TEXT',
-            'mediumtext': 'TEXT',
-            'longtext': 'TEXT',
-            'datetime': 'TIMESTAMP',
-            'timestamp': 'TIMESTAMP',
-            'date': 'DATE',
-            'time': 'TIME',
-            'json': 'JSON',
-            'enum': 'VARCHAR(255)',
-            'blob': 'BYTEA',
-            'tinyblob': 'BYTEA',
-            'mediumblob': 'BYTEA',
-            'longblob': 'BYTEA',
-        }
+        # 类型映射（模块级共享，转换结果按类型字符串缓存）
+        self.type_mapping = _TYPE_MAPPING
+        
+        # 表名 -> MySQL表结构，迁移结构时获取（或由 prefetch_schema 预取），迁移数据时复用
+        self._structure_cache: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # 表名 -> 索引列表 / 估算行数，由 prefetch_schema 预取
+        self._index_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._count_cache: Dict[str, Optional[int]] = {}
     
     def set_progress_callback(self, callback: Callable[[str, int, int], None]):
         """
@@ -89,26 +226,25 @@ class MySQLToPostgreSQLMigrator:
         """
         测试数据库连接
         
+        两个数据库同时测试，启动耗时取决于较慢的一方而不是两者之和。
+        
         Returns:
             Dict[str, bool]: 连接测试结果
         """
-        results = {}
-        
-        # 测试MySQL连接
-        try:
-            results['mysql'] = self.mysql_connector.test_connection()
-        except Exception as e:
-            logging.error(f"MySQL连接测试失败: {e}")
-            results['mysql'] = False
-        
-        # 测试PostgreSQL连接
-        try:
-            results['postgresql'] = self.pg_connector.test_connection()
-        except Exception as e:
-            logging.error(f"PostgreSQL连接测试失败: {e}")
-            results['postgresql'] = False
+        def probe(name: str, connector) -> bool:
+            try:
+                return connector.test_connection()
+            except Exception as e:
+                logging.error(f"{name}连接测试失败: {e}")
+                return False
         
-        return results
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            mysql_future = executor.submit(probe, 'MySQL', self.mysql_connector)
+            pg_future = executor.submit(probe, 'PostgreSQL', self.pg_connector)
+            return {
+                'mysql': mysql_future.result(),
+                'postgresql': pg_future.result()
+            }
     
     def convert_column_type(self, mysql_type: str) -> str:
         """
@@ -128,56 +264,7 @@ class MySQLToPostgreSQLMigrator:
                - 如果 auto_convert_tinyint_to_bool=False，转换为 SMALLINT 类型
             3. 其他带长度的 tinyint（如tinyint(2)）转换为 SMALLINT 类型
         """
-        # 提取基本类型
-        base_type = mysql_type.lower().split('(')[0]
-        
-        # 检查是否是 unsigned
-        is_unsigned = 'unsigned' in mysql_type.lower()
-        
-        # 移除 unsigned 等修饰符，只保留基本类型名称
-        base_type = re.sub(r'\s+(unsigned|signed|zerofill)', '', base_type).strip()
-        
-        # 获取长度/精度
-        length_match = re.search(r'\(([^)]+)\)', mysql_type)
-        length = length_match.group(1) if length_match else None
-        
-        # 特殊处理 tinyint 类型
-        if base_type == 'tinyint':
-            # tinyint(1) 通常用作布尔值
-            if length == '1':
-                return 'BOOLEAN'
-            elif length is None and self.auto_convert_tinyint_to_bool and not is_unsigned:
-                # 没有长度的tinyint，根据配置选择是否转换为布尔值
-                # 但无符号tinyint不转换为布尔值，因为它们通常用作小整数
-                return 'BOOLEAN'
-            else:
-                # 其他 tinyint 作为小整数
-                return 'SMALLINT'
-        
-        # 转换其他类型
-        pg_type = self.type_mapping.get(base_type, 'TEXT')
-        
-        # 处理特殊情况
-        if base_type in ['varchar', 'char'] and length:
-            pg_type = f"{pg_type}({length})"
-        elif base_type == 'decimal' and length:
-            pg_type = f"{pg_type}({length})"
-        elif base_type == 'int' and is_unsigned:
-            pg_type = 'BIGINT'  # unsigned int 需要更大的类型
-        elif base_type == 'bigint' and is_unsigned:
-            # unsigned bigint 在 PostgreSQL 中仍然使用 BIGINT，但需要注意数据范围
-            # MySQL的 unsigned bigint 范围是 0 到 18446744073709551615
-            # PostgreSQL的 bigint 范围是 -9223372036854775808 到 9223372036854775807
-            # 对于超出范围的值，可能需要使用 NUMERIC 类型，但这里保持 BIGINT 以保持性能
-            pg_type = 'BIGINT'
-        elif base_type == 'smallint' and is_unsigned:
-            # unsigned smallint 可以用 integer 来存储
-            pg_type = 'INTEGER'
-        elif base_type == 'mediumint' and is_unsigned:
-            # unsigned mediumint 可以用 integer 来存储
-            pg_type = 'INTEGER'
-        
-        return pg_type
+        return _convert_column_type(mysql_type, self.auto_convert_tinyint_to_bool)
     
     def create_table_sql(self, table_name: str, columns: List[Dict[str, Any]]) -> str:
         """
@@ -202,42 +289,42 @@ class MySQLToPostgreSQLMigrator:
                 col_type = 'SERIAL' if 'int' in col['Type'].lower() else 'BIGSERIAL'
             
             # 构建列定义
-            col_def = f'"{col_name}" {col_type}'
+            col_def = [_quote_identifier(col_name), col_type]
             
             # 处理 NULL/NOT NULL
             if col['Null'] == 'NO' and 'auto_increment' not in col.get('Extra', ''):
-                col_def += ' NOT NULL'
+                col_def.append('NOT NULL')
             
             # 处理默认值
             if col['Default'] is not None and 'auto_increment' not in col.get('Extra', ''):
                 if col['Default'] == 'CURRENT_TIMESTAMP':
-                    col_def += ' DEFAULT CURRENT_TIMESTAMP'
+                    col_def.append('DEFAULT CURRENT_TIMESTAMP')
                 else:
-                    col_def += f" DEFAULT '{col['Default']}'"
+                    col_def.append(f"DEFAULT {_quote_literal(col['Default'])}")
             
-            column_defs.append(col_def)
+            column_defs.append(f"  {' '.join(col_def)}")
             
             # 记录主键
             if col['Key'] == 'PRI':
-                primary_keys.append(f'"{col_name}"')
-        
-        # 构建 CREATE TABLE 语句
-        create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" (\n'
-        create_sql += ',\n'.join(f'  {col}' for col in column_defs)
+                primary_keys.append(_quote_identifier(col_name))
         
         if primary_keys:
-            create_sql += f',\n  PRIMARY KEY ({", ".join(primary_keys)})'
+            column_defs.append(f'  PRIMARY KEY ({", ".join(primary_keys)})')
         
-        create_sql += '\n);'
-        
-        return create_sql
+        # 构建 CREATE TABLE 语句（一次拼接）
+        return '\n'.join([
+            f'CREATE TABLE IF NOT EXISTS {_quote_identifier(table_name)} (',
+            ',\n'.join(column_defs),
+            ');'
+        ])
     
-    def migrate_table_structure(self, table_name: str) -> bool:
+    def migrate_table_structure(self, table_name: str, include_primary_key: bool = True) -> bool:
         """
         迁移表结构
         
         Args:
             table_name: 表名
+            include_primary_key: 是否同时创建主键，为False时需在数据导入后调用 create_primary_key
             
         Returns:
             bool: 迁移是否成功
@@ -245,18 +332,23 @@ class MySQLToPostgreSQLMigrator:
         self._report_progress(f"创建表结构: {table_name}")
         
         try:
-            # 获取表结构
-            columns = self.mysql_connector.get_table_structure(table_name)
+            # 获取表结构（优先使用预取结果）
+            columns = self._structure_cache.get(table_name)
+            if not columns:
+                columns = self.mysql_connector.get_table_structure(table_name)
             if not columns:
                 logging.error(f"无法获取表 {table_name} 的结构")
                 return False
             
-            # 转换列类型
-            for col in columns:
-                col['Type'] = self.convert_column_type(col['Type'])
+            self._structure_cache[table_name] = columns
+            
+            # 转换列类型（使用副本，保留原始结构供数据迁移使用）
+            pg_columns = [dict(col, Type=self.convert_column_type(col['Type'])) for col in columns]
             
             # 在 PostgreSQL 中创建表
-            success = self.pg_connector.create_table(table_name, columns)
+            success = self.pg_connector.create_table(
+                table_name, pg_columns, include_primary_key=include_primary_key
+            )
             if success:
                 self._report_progress(f"  ✓ 表结构创建成功: {table_name}")
                 return True
@@ -269,13 +361,52 @@ class MySQLToPostgreSQLMigrator:
             self._report_progress(f"  ✗ 创建表结构失败: {table_name} - {e}")
             return False
     
-    def migrate_table_data(self, table_name: str, batch_size: int = 1000) -> bool:
+    def create_primary_key(self, table_name: str) -> bool:
+        """
+        数据导入后创建主键
+        
+        Args:
+            table_name: 表名
+            
+        Returns:
+            bool: 创建是否成功
+        """
+        columns = self._structure_cache.get(table_name)
+        if columns is None:
+            columns = self.mysql_connector.get_table_structure(table_name)
+        primary_keys = [col['Field'] for col in columns if col['Key'] == 'PRI']
+        if not primary_keys:
+            return True
+        
+        if self.pg_connector.add_primary_key(table_name, primary_keys):
+            self._report_progress(f"  ✓ 创建主键: {table_name}")
+            return True
+        
+        self._report_progress(f"  ✗ 创建主键失败: {table_name}")
+        return False
+    
+    def migrate_table_data(self, table_name: str, batch_size: int = DEFAULT_FETCH_SIZE,
+                           columns: Optional[List[Dict[str, Any]]] = None,
+                           copy_rows: int = DEFAULT_COPY_ROWS,
+                           commit_rows: int = DEFAULT_COMMIT_ROWS,
+                           exact_count: bool = False, freeze: bool = False,
+                           copy_threads: int = 1, where_clause: str = "",
+                           sync_sequences: bool = True) -> bool:
         """
         迁移表数据
         
         Args:
             table_name: 表名
-            batch_size: 批处理大小
+            batch_size: 每次从MySQL读取的行数
+            columns: MySQL表结构，None时优先使用迁移结构时缓存的结果
+            copy_rows: 每次写入PostgreSQL的最大行数（实际行数按写入耗时自动调整）
+            commit_rows: 每写入多少行提交一次
+            exact_count: 是否先用 COUNT(*) 统计精确行数（大表需要额外一次全表扫描）
+            freeze: 目标表为刚创建的空表时，首个事务先 TRUNCATE 再用 COPY FREEZE 写入，
+                    行直接以冻结状态写入，之后无需再为设置提示位或 VACUUM FREEZE 重写整表
+            copy_threads: 大于1且表有单列整数主键时，按主键范围拆分，由多个连接同时读取和写入
+            where_clause: 只迁移满足条件的行（按范围并行迁移时使用）
+            sync_sequences: 迁移结束后是否更新序列
             
         Returns:
             bool: 迁移是否成功
@@ -283,96 +414,324 @@ class MySQLToPostgreSQLMigrator:
         self._report_progress(f"迁移数据: {table_name}")
         
         try:
-            # 获取总行数
-            total_rows = self.mysql_connector.get_table_count(table_name)
-            self._report_progress(f"  总行数: {total_rows:,}")
+            # 获取总行数（默认使用统计信息中的估算值，避免额外的全表扫描）
+            if exact_count:
+                total_rows = self.mysql_connector.get_table_count(table_name)
+                self._report_progress(f"  总行数: {total_rows:,}")
+                
+                if total_rows == 0:
+                    self._report_progress("  ✓ 无数据需要迁移")
+                    return True
+            else:
+                # 估算值可能为0，不能据此跳过数据迁移
+                total_rows = self._count_cache.get(table_name)
+                if total_rows is None:
+                    total_rows = self.mysql_connector.get_approx_table_count(table_name)
+                self._report_progress(f"  估算行数: {total_rows:,}")
             
-            if total_rows == 0:
-                self._report_progress("  ✓ 无数据需要迁移")
-                return True
+            # 获取列信息（避免重复查询表结构）
+            if columns is None:
+                columns = self._structure_cache.get(table_name)
+            if columns is None:
+                columns = self.mysql_connector.get_table_structure(table_name)
             
-            # 获取列信息
-            columns = self.mysql_connector.get_table_structure(table_name)
-            column_names = [col['Field'] for col in columns]
+            # 按主键范围拆分，多个连接并行迁移
+            if copy_threads > 1:
+                ranges = self._split_key_ranges(table_name, columns, copy_threads)
+                if ranges:
+                    return self._migrate_table_data_parallel(
+                        table_name, columns, ranges, total_rows,
+                        batch_size, copy_rows, commit_rows
+                    )
             
-            # 创建列类型映射，用于数据转换
-            column_type_map = {}
+            # 一次遍历列信息，记录列名和需要转换的列
+            column_names = []
             boolean_columns = set()
+            bytea_columns = set()
             for col in columns:
-                original_type = col['Type']
-                converted_type = self.convert_column_type(original_type)
-                column_type_map[col['Field']] = {
-                    'original': original_type,
-                    'converted': converted_type
-                }
+                column_names.append(col['Field'])
+                converted_type = self.convert_column_type(col['Type'])
                 # 记录需要转换为布尔值的列
                 if converted_type == 'BOOLEAN':
                     boolean_columns.add(col['Field'])
+                # 记录二进制列
+                elif converted_type == 'BYTEA':
+                    bytea_columns.add(col['Field'])
+            
+            # 目标列类型每张表只查询一次，二进制 COPY 和 UNNEST 回退都使用
+            pg_types = self.pg_connector.get_column_types(table_name)
+            
+            # 含二进制列且所有目标列类型都支持时使用二进制 COPY，避免十六进制转义使数据量翻倍
+            use_binary = False
+            target_types = []
+            if bytea_columns:
+                target_types = [pg_types.get(name) for name in column_names]
+                use_binary = self.pg_connector.supports_binary_copy(target_types)
+            # 文本 COPY 需要将二进制数据转换为 \x 十六进制文本
+            hex_columns = set() if use_binary else bytea_columns
+            
+            # 布尔列在 MySQL 端计算为 0/1（NULL 保持 NULL），PostgreSQL 直接接受，
+            # 不需要在 Python 中逐个值转换
+            select_exprs = None
+            if boolean_columns:
+                select_exprs = []
+                for name in column_names:
+                    quoted = _quote_mysql_identifier(name)
+                    select_exprs.append(f"({quoted} <> 0) AS {quoted}" if name in boolean_columns else quoted)
+            
+            # 按列位置预先确定需要转换的列，行数据本身是元组，不做按列名查找
+            converters = []
+            for i, col_name in enumerate(column_names):
+                if col_name in hex_columns:
+                    # 二进制数据转换为 bytea 的十六进制输入格式
+                    converters.append((i, _to_bytea_hex))
+            
+            def convert_rows(rows):
+                """转换数据类型，没有需要转换的列时直接返回原始行
+
+                在 fetchmany 返回的列表中原地替换各行，不再另建一个同样大小的列表。
+                """
+                if not converters:
+                    return rows
+                for j, row in enumerate(rows):
+                    converted_row = list(row)
+                    for i, convert in converters:
+                        value = converted_row[i]
+                        if value is not None:
+                            converted_row[i] = convert(value)
+                    rows[j] = converted_row
+                return rows
+            
+            # 读写流水线：后台线程流式读取MySQL并转换，当前线程写入PostgreSQL
+            # （流式读取只扫描一次源表，内存占用以 PIPELINE_QUEUE_SIZE 个批次为上限）
+            batch_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+            stop_event = threading.Event()
+            producer = threading.Thread(
+                target=self._produce_batches,
+                args=(table_name, batch_size, convert_rows, batch_queue, stop_event,
+                      select_exprs, where_clause),
+                daemon=True
+            )
+            producer.start()
             
-            # 批量迁移数据
-            offset = 0
             migrated_rows = 0
-            batch_count = 0
+            uncommitted_rows = 0
+            last_report_time = 0.0
+            # 当前每次写入的行数：行较宽或服务器较慢时减小，以控制单次写入的耗时和内存
+            chunk_rows = copy_rows
+            use_copy = True
+            pending = []
             
-            while offset < total_rows:
-                # 获取数据
-                rows = self.mysql_connector.get_table_data(
-                    table_name, batch_size, offset
-                )
-                
-                if not rows:
-                    break
-                
-                # 转换数据类型
-                converted_rows = []
-                for row in rows:
-                    converted_row = []
-                    for i, value in enumerate(row):
-                        col_name = column_names[i]
-                        
-                        # 如果是需要转换为布尔值的列
-                        if col_name in boolean_columns and value is not None:
-                            # 将 0/1 转换为 False/True
-                            converted_value = bool(value)
-                        else:
-                            converted_value = value
-                        
-                        converted_row.append(converted_value)
-                    converted_rows.append(tuple(converted_row))
-                
-                # 插入转换后的数据到PostgreSQL
-                success = self.pg_connector.insert_data(table_name, column_names, converted_rows)
-                if not success:
-                    logging.error(f"插入数据失败: {table_name}")
-                    return False
-                
-                migrated_rows += len(rows)
-                offset += batch_size
-                batch_count += 1
-                
-                # 计算进度百分比
-                progress_percent = min(100, (migrated_rows / total_rows) * 100)
-                
-                # 报告详细进度（每10批或最后一批报告一次）
-                if batch_count % 10 == 0 or migrated_rows >= total_rows:
-                    self._report_progress(
-                        f"  ⏳ {table_name}: {migrated_rows:,}/{total_rows:,} 行 ({progress_percent:.1f}%)",
-                        migrated_rows,
-                        total_rows
-                    )
+            def write_chunk(chunk) -> bool:
+                """写入一块数据（不提交），COPY 失败时回退到 UNNEST 数组插入"""
+                nonlocal use_copy
+                if use_copy:
+                    if use_binary:
+                        copied = self.pg_connector.copy_data_binary(
+                            table_name, column_names, target_types, chunk, commit=False,
+                            freeze=use_freeze
+                        )
+                    else:
+                        copied = self.pg_connector.copy_data(table_name, column_names, chunk,
+                                                             commit=False, freeze=use_freeze)
+                    if copied:
+                        return True
+                    use_copy = False
+                    logging.warning(f"COPY写入失败，改用INSERT: {table_name}")
+                    self._report_progress(f"  ! COPY写入失败，改用INSERT: {table_name}")
+                    # 失败会回滚本事务中尚未提交的数据，无法只重试当前块
+                    if uncommitted_rows:
+                        return False
+                return self.pg_connector.insert_data_unnest(table_name, column_names, chunk, commit=False,
+                                                            column_types=pg_types)
+            
+            # 整张表的数据在显式事务中写入，每 commit_rows 行提交一次
+            self.pg_connector.begin_transaction(synchronous_commit=False)
+            
+            # FREEZE 要求表在当前事务中创建或清空，因此只在第一个事务中使用
+            use_freeze = freeze and self.pg_connector.truncate_table(table_name, commit=False)
+            if freeze and not use_freeze:
+                self.pg_connector.begin_transaction(synchronous_commit=False)
+            
+            try:
+                while True:
+                    converted_rows = batch_queue.get()
+                    if isinstance(converted_rows, Exception):
+                        raise converted_rows
+                    finished = converted_rows is None
+                    if not finished:
+                        pending.extend(converted_rows)
+                    
+                    # 攒够 chunk_rows 行（或读取结束）才写入一次
+                    if not pending or (len(pending) < chunk_rows and not finished):
+                        if finished:
+                            # 最后一块恰好已写入，提交剩余未提交的数据
+                            if uncommitted_rows:
+                                self.pg_connector.commit_transaction()
+                            break
+                        continue
+                    
+                    write_start = time.perf_counter()
+                    if not write_chunk(pending):
+                        logging.error(f"插入数据失败: {table_name}")
+                        self.pg_connector.rollback_transaction()
+                        return False
+                    
+                    # 按本次写入耗时调整下一次写入的行数，使单次写入接近 COPY_TARGET_SECONDS
+                    elapsed = time.perf_counter() - write_start
+                    if elapsed > 0:
+                        scaled_rows = int(len(pending) * COPY_TARGET_SECONDS / elapsed)
+                        chunk_rows = max(batch_size, min(copy_rows, scaled_rows))
+                    
+                    migrated_rows += len(pending)
+                    uncommitted_rows += len(pending)
+                    pending = []
+                    
+                    # 每 commit_rows 行提交一次
+                    if uncommitted_rows >= commit_rows or finished:
+                        self.pg_connector.commit_transaction()
+                        uncommitted_rows = 0
+                        use_freeze = False
+                        if not finished:
+                            self.pg_connector.begin_transaction(synchronous_commit=False)
+                    
+                    if finished:
+                        self._report_progress(
+                            f"  ⏳ {table_name}: {migrated_rows:,}/{migrated_rows:,} 行 (100.0%)",
+                            migrated_rows,
+                            migrated_rows
+                        )
+                        break
+                    
+                    # 报告进度（最多每 PROGRESS_REPORT_INTERVAL 秒一次，总行数仅用于显示进度）
+                    # 估算行数可能偏小，结束前最多显示99.9%；使用千分比整数运算，避免浮点计算
+                    now = time.monotonic()
+                    if now - last_report_time >= PROGRESS_REPORT_INTERVAL:
+                        last_report_time = now
+                        display_total = max(total_rows, migrated_rows)
+                        permille = min(999, migrated_rows * 1000 // display_total)
+                        self._report_progress(
+                            f"  ⏳ {table_name}: {migrated_rows:,}/{display_total:,} 行 ({permille // 10}.{permille % 10}%)",
+                            migrated_rows,
+                            display_total
+                        )
+            finally:
+                # 写入结束或失败时通知读取线程停止
+                stop_event.set()
+                producer.join()
             
             self._report_progress(f"  ✓ 数据迁移完成: {table_name} ({migrated_rows:,} 行)")
             
             # 更新序列
-            self.update_sequences(table_name)
+            if sync_sequences:
+                self.update_sequences(table_name)
             
             return True
             
         except Exception as e:
+            # 回滚尚未提交的数据
+            self.pg_connector.rollback_transaction()
             logging.error(f"数据迁移失败: {e}")
             self._report_progress(f"  ✗ 数据迁移失败: {table_name} - {e}")
             return False
     
+    def _split_key_ranges(self, table_name: str, columns: List[Dict[str, Any]],
+                          parts: int) -> List[str]:
+        """
+        按单列整数主键的取值范围把表拆分为若干段
+        
+        按键值等宽拆分（只需一次 MIN/MAX 查询），键值分布不均匀时各段行数可能不同。
+        
+        Returns:
+            List[str]: 每段的 WHERE 条件，无法拆分时为空列表
+        """
+        pk_columns = [col for col in columns if col['Key'] == 'PRI']
+        if len(pk_columns) != 1:
+            return []
+        # 按基础类型判断，避免 point 等名称中含 int 的类型被当作整数
+        if _convert_column_type(pk_columns[0]['Type'], False) not in ('SMALLINT', 'INTEGER', 'BIGINT'):
+            return []
+        
+        low, high = self.mysql_connector.get_column_range(table_name, pk_columns[0]['Field'])
+        if low is None or high is None or high - low < parts:
+            return []
+        
+        step = (high - low) // parts + 1
+        bounds = [low + step * i for i in range(1, parts)]
+        key = _quote_mysql_identifier(pk_columns[0]['Field'])
+        ranges = [f"{key} < {bounds[0]}"]
+        for start, end in zip(bounds, bounds[1:]):
+            ranges.append(f"{key} >= {start} AND {key} < {end}")
+        ranges.append(f"{key} >= {bounds[-1]}")
+        return ranges
+    
+    def _migrate_table_data_parallel(self, table_name: str, columns: List[Dict[str, Any]],
+                                     ranges: List[str], total_rows: int, batch_size: int,
+                                     copy_rows: int, commit_rows: int) -> bool:
+        """
+        每个主键范围使用独立的迁移器和连接同时迁移，全部完成后更新序列
+        
+        各段由不同会话写入，不能使用 COPY FREEZE。
+        """
+        self._report_progress(f"  按主键范围拆分为 {len(ranges)} 段并行迁移: {table_name}")
+        rows_per_range = max(1, total_rows // len(ranges))
+        
+        def migrate_range(where_clause: str) -> bool:
+            worker = self._create_worker()
+            # 每段只显示本段的估算行数
+            worker._count_cache = {**self._count_cache, table_name: rows_per_range}
+            try:
+                if not worker.mysql_connector.connect() or not worker.pg_connector.connect():
+                    return False
+                worker.pg_connector.configure_bulk_load_session()
+                return worker.migrate_table_data(
+                    table_name, batch_size, columns=columns,
+                    copy_rows=copy_rows, commit_rows=commit_rows,
+                    where_clause=where_clause, sync_sequences=False
+                )
+            finally:
+                worker.mysql_connector.disconnect()
+                worker.pg_connector.disconnect()
+        
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(migrate_range, ranges))
+        
+        if not all(results):
+            self._report_progress(f"  ✗ 数据迁移失败: {table_name} ({results.count(False)} 段失败)")
+            return False
+        
+        self._report_progress(f"  ✓ 数据迁移完成: {table_name}")
+        self.update_sequences(table_name)
+        return True
+    
+    def _produce_batches(self, table_name: str, batch_size: int, convert_rows,
+                         batch_queue: queue.Queue, stop_event: threading.Event,
+                         select_exprs: Optional[List[str]] = None, where_clause: str = ""):
+        """
+        读取线程：流式读取MySQL数据并转换后放入队列
+        
+        读取结束放入 None，出错时放入异常对象，由写入端处理。
+        """
+        def put(item) -> bool:
+            # 写入端已停止时不再阻塞等待
+            while not stop_event.is_set():
+                try:
+                    batch_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        try:
+            for rows in self.mysql_connector.stream_table_data(table_name, batch_size,
+                                                               where_clause=where_clause,
+                                                               select_exprs=select_exprs):
+                if not put(convert_rows(rows)):
+                    return
+            put(None)
+        except Exception as e:
+            put(e)
+    
     def update_sequences(self, table_name: str):
         """
         更新 PostgreSQL 序列的当前值
@@ -394,20 +753,26 @@ class MySQLToPostgreSQLMigrator:
                     
                     serial_columns = cursor.fetchall()
                     
-                    for col_name, col_default in serial_columns:
+                    # 一次扫描算出所有序列列的最大值，再在同一条语句中更新全部序列
+                    max_exprs = []
+                    setval_exprs = []
+                    seq_names = []
+                    for i, (col_name, col_default) in enumerate(serial_columns):
                         # 提取序列名
-                        seq_match = re.search(r"'([^']+)'", col_default)
+                        seq_match = _SEQ_NAME_RE.search(col_default)
                         if seq_match:
-                            seq_name = seq_match.group(1)
-                            
-                            # 获取列的最大值
-                            cursor.execute(f'SELECT MAX("{col_name}") FROM "{table_name}"')
-                            max_val = cursor.fetchone()[0]
-                            
-                            if max_val:
-                                # 更新序列
-                                cursor.execute(f"SELECT setval('{seq_name}', %s, true)", (max_val,))
-                                self._report_progress(f"  ✓ 更新序列 {seq_name} 到 {max_val}")
+                            max_exprs.append(f'MAX("{col_name}") AS m{i}')
+                            # 空表时重置为1且下一个值从1开始
+                            setval_exprs.append(f'setval(%s, COALESCE(m.m{i}, 1), m.m{i} IS NOT NULL)')
+                            seq_names.append(seq_match.group(1))
+                    
+                    if seq_names:
+                        cursor.execute(
+                            f'WITH m AS (SELECT {", ".join(max_exprs)} FROM "{table_name}") '
+                            f'SELECT {", ".join(setval_exprs)} FROM m',
+                            seq_names
+                        )
+                        self._report_progress(f"  ✓ 更新序列: {', '.join(seq_names)}")
                     
                     self.pg_connector.connection.commit()
         except Exception as e:
@@ -427,49 +792,62 @@ class MySQLToPostgreSQLMigrator:
         self._report_progress(f"创建索引: {table_name}")
         
         try:
-            indexes = self.mysql_connector.get_indexes(table_name)
+            indexes = self._index_cache.get(table_name)
+            if indexes is None:
+                indexes = self.mysql_connector.get_indexes(table_name)
             
             if not self.pg_connector.connection:
                 return False
             
-            # 创建索引
+            # 所有索引在同一事务中创建，只提交一次；
+            # 每个索引使用保存点，单个索引失败不影响其它索引
+            failed_indexes = []
             with self.pg_connector.connection.cursor() as cursor:
                 for idx in indexes:
+                    idx_name = idx['name']
+                    
+                    # 跳过主键索引
+                    if idx['is_primary']:
+                        continue
+                    
+                    # 构建列列表
+                    columns = []
+                    for col in idx['columns']:
+                        columns.append(f'"{col["name"]}"')
+                    
+                    if not columns:
+                        continue
+                    
+                    unique = 'UNIQUE' if idx['is_unique'] else ''
+                    columns_str = ', '.join(columns)
+                    
+                    create_idx_sql = f'''
+                    CREATE {unique} INDEX IF NOT EXISTS "{idx_name}_{table_name}_idx"
+                    ON "{table_name}" ({columns_str});
+                    '''
+                    
                     try:
-                        idx_name = idx['name']
-                        
-                        # 跳过主键索引
-                        if idx['is_primary']:
-                            continue
-                        
-                        # 构建列列表
-                        columns = []
-                        for col in idx['columns']:
-                            columns.append(f'"{col["name"]}"')
-                        
-                        if not columns:
-                            continue
-                        
-                        unique = 'UNIQUE' if idx['is_unique'] else ''
-                        columns_str = ', '.join(columns)
-                        
-                        create_idx_sql = f'''
-                        CREATE {unique} INDEX IF NOT EXISTS "{idx_name}_{table_name}_idx"
-                        ON "{table_name}" ({columns_str});
-                        '''
-                        
+                        cursor.execute("SAVEPOINT create_index")
                         cursor.execute(create_idx_sql)
-                        self.pg_connector.connection.commit()
+                        cursor.execute("RELEASE SAVEPOINT create_index")
                         self._report_progress(f"  ✓ 创建索引: {idx_name}")
-                        
                     except Exception as e:
-                        self.pg_connector.connection.rollback()
+                        cursor.execute("ROLLBACK TO SAVEPOINT create_index")
+                        failed_indexes.append(idx_name)
                         logging.error(f"创建索引 {idx_name} 失败: {e}")
                         self._report_progress(f"  ✗ 创建索引 {idx_name} 失败: {e}")
             
+            self.pg_connector.connection.commit()
+            
+            if failed_indexes:
+                self._report_progress(f"  ! {table_name} 有 {len(failed_indexes)} 个索引创建失败: "
+                                      f"{', '.join(failed_indexes)}")
+            
             return True
             
         except Exception as e:
+            if self.pg_connector.connection:
+                self.pg_connector.connection.rollback()
             logging.error(f"创建索引失败: {e}")
             self._report_progress(f"  ✗ 创建索引失败: {table_name} - {e}")
             return False
@@ -509,16 +887,26 @@ class MySQLToPostgreSQLMigrator:
     def migrate(
         self, 
         tables: Optional[List[str]] = None,
-        batch_size: int = 1000,
-        include_indexes: bool = True
+        batch_size: int = DEFAULT_FETCH_SIZE,
+        include_indexes: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        copy_rows: int = DEFAULT_COPY_ROWS,
+        commit_rows: int = DEFAULT_COMMIT_ROWS,
+        exact_count: bool = False,
+        copy_threads: int = 1
     ) -> Dict[str, Any]:
         """
         执行完整的迁移过程
         
         Args:
             tables: 要迁移的表列表，None表示所有表
-            batch_size: 批处理大小
+            batch_size: 每次从MySQL读取的行数
             include_indexes: 是否包含索引迁移
+            max_workers: 同时迁移的表数量，每个工作线程使用独立的数据库连接
+            copy_rows: 每次写入PostgreSQL的行数
+            commit_rows: 每写入多少行提交一次
+            exact_count: 是否用 COUNT(*) 统计精确行数用于显示进度
+            copy_threads: 单个表按主键范围拆分后同时迁移的段数（1表示不拆分）
             
         Returns:
             Dict[str, Any]: 迁移结果统计
@@ -528,8 +916,9 @@ class MySQLToPostgreSQLMigrator:
             'total_tables': 0,
             'migrated_tables': 0,
             'failed_tables': [],
-            'errors': []
+            'errors': deque(maxlen=MAX_RECORDED_ERRORS)
         }
+        worker_pool = _WorkerPool(self)
         
         try:
             self._report_progress("开始迁移...")
@@ -550,34 +939,37 @@ class MySQLToPostgreSQLMigrator:
             results['total_tables'] = len(tables)
             self._report_progress(f"找到 {len(tables)} 个表")
             
-            # 迁移每个表
-            for i, table in enumerate(tables, 1):
-                self._report_progress(f"\n[{i}/{len(tables)}] 处理表: {table}")
+            # 一次性预取所有表的结构、索引和行数
+            self.prefetch_schema()
+            
+            # 按表并行迁移，每个工作线程复用一个迁移器和一组连接
+            # 按估算行数从大到小提交，大表最先开始，避免最后只剩一个大表在单独运行
+            workers = max(1, min(max_workers, len(tables)))
+            submit_order = sorted(tables, key=lambda t: self._count_cache.get(t) or 0, reverse=True)
+            positions = {table: i for i, table in enumerate(tables, 1)}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    table: executor.submit(self._migrate_one_table, worker_pool, table,
+                                           positions[table], len(tables),
+                                           batch_size, include_indexes, copy_rows, commit_rows,
+                                           exact_count, copy_threads)
+                    for table in submit_order
+                }
                 
-                try:
-                    # 迁移表结构
-                    if not self.migrate_table_structure(table):
-                        results['failed_tables'].append(table)
-                        continue
+                # 按表列表顺序汇总结果
+                for table in tables:
+                    future = futures[table]
+                    try:
+                        success, error_msg = future.result()
+                    except Exception as e:
+                        success, error_msg = False, f"表 {table} 迁移失败: {e}"
                     
-                    # 迁移数据
-                    if not self.migrate_table_data(table, batch_size):
+                    if success:
+                        results['migrated_tables'] += 1
+                    else:
                         results['failed_tables'].append(table)
-                        continue
-                    
-                    # 创建索引
-                    if include_indexes:
-                        self.create_indexes(table)
-                    
-                    results['migrated_tables'] += 1
-                    self._report_progress(f"✓ 表 {table} 迁移完成")
-                    
-                except Exception as e:
-                    error_msg = f"表 {table} 迁移失败: {e}"
-                    logging.error(error_msg)
-                    results['failed_tables'].append(table)
-                    results['errors'].append(error_msg)
-                    self._report_progress(f"✗ {error_msg}")
+                        if error_msg:
+                            results['errors'].append(error_msg)
             
             results['success'] = results['migrated_tables'] > 0
             
@@ -599,11 +991,94 @@ class MySQLToPostgreSQLMigrator:
         
         finally:
             # 断开连接
+            worker_pool.close()
             self.mysql_connector.disconnect()
             self.pg_connector.disconnect()
         
+        # 调用方会对错误列表切片，返回普通列表
+        results['errors'] = list(results['errors'])
         return results
     
+    def prefetch_schema(self):
+        """
+        预取当前库所有表的元数据，后续迁移结构、数据、索引时不再逐表查询
+        
+        预取失败时只记录警告，迁移过程会回退到逐表查询。
+        """
+        try:
+            schema = self.mysql_connector.prefetch_schema()
+        except Exception as e:
+            logging.warning(f"预取表元数据失败，将逐表查询: {e}")
+            return
+        
+        self._structure_cache.update(schema['structures'])
+        self._index_cache = schema['indexes']
+        self._count_cache = schema['counts']
+    
+    def _create_worker(self) -> 'MySQLToPostgreSQLMigrator':
+        """创建使用独立连接的工作迁移器，共享配置和进度回调"""
+        worker = MySQLToPostgreSQLMigrator(
+            self.mysql_config,
+            self.pg_config,
+            auto_convert_tinyint_to_bool=self.auto_convert_tinyint_to_bool
+        )
+        worker.progress_callback = self.progress_callback
+        # 共享预取的元数据（只读）
+        worker._structure_cache = dict(self._structure_cache)
+        worker._index_cache = self._index_cache
+        worker._count_cache = self._count_cache
+        return worker
+    
+    def _migrate_one_table(self, worker_pool: '_WorkerPool', table: str, index: int, total: int,
+                           batch_size: int, include_indexes: bool,
+                           copy_rows: int, commit_rows: int, exact_count: bool,
+                           copy_threads: int = 1):
+        """
+        在工作线程中迁移单个表
+        
+        Returns:
+            Tuple[bool, Optional[str]]: (是否成功, 错误信息)
+        """
+        self._report_progress(f"\n[{index}/{total}] 处理表: {table}")
+        
+        worker = None
+        try:
+            worker = worker_pool.acquire()
+            
+            # 迁移表结构（主键在数据导入后再创建）
+            if not worker.migrate_table_structure(table, include_primary_key=False):
+                return False, None
+            
+            # 迁移数据（表刚由上一步重建，可以使用 COPY FREEZE）
+            if not worker.migrate_table_data(table, batch_size,
+                                             copy_rows=copy_rows, commit_rows=commit_rows,
+                                             exact_count=exact_count, freeze=True,
+                                             copy_threads=copy_threads):
+                return False, None
+            
+            # 创建主键
+            if not worker.create_primary_key(table):
+                return False, f"表 {table} 创建主键失败"
+            
+            # 创建索引
+            if include_indexes:
+                worker.create_indexes(table)
+            
+            # 导入完成后收集统计信息
+            worker.pg_connector.analyze_table(table)
+            
+            worker._report_progress(f"✓ 表 {table} 迁移完成")
+            return True, None
+            
+        except Exception as e:
+            error_msg = f"表 {table} 迁移失败: {e}"
+            logging.error(error_msg)
+            self._report_progress(f"✗ {error_msg}")
+            # 出错后连接状态未知，下一个表重新建立连接
+            if worker is not None:
+                worker_pool.discard()
+            return False, error_msg
+    
     def get_migration_preview(self, tables: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         获取迁移预览信息
@@ -620,6 +1095,8 @@ class MySQLToPostgreSQLMigrator:
             'estimated_time': 0
         }
         
+        # 复用已打开的连接（如 test_connections 之后），只关闭本方法自己打开的连接
+        opened_here = not self.mysql_connector.is_connected()
         try:
             if not self.mysql_connector.connect():
                 return preview
@@ -627,26 +1104,94 @@ class MySQLToPostgreSQLMigrator:
             if tables is None:
                 tables = self.mysql_connector.get_tables()
             
+            # 两次查询获取所有表的行数（估算值）和列数
+            schema_preview = self.mysql_connector.get_schema_preview()
+            
             for table in tables:
+                info = schema_preview.get(table, {})
+                rows = info.get('rows')
+                column_count = info.get('columns')
+                if rows is None:
+                    rows = self.mysql_connector.get_table_count(table)
+                if column_count is None:
+                    column_count = len(self.mysql_connector.get_table_structure(table))
                 table_info = {
                     'name': table,
-                    'rows': self.mysql_connector.get_table_count(table),
-                    'columns': len(self.mysql_connector.get_table_structure(table))
+                    'rows': rows,
+                    'columns': column_count
                 }
                 preview['tables'].append(table_info)
                 preview['total_rows'] += table_info['rows']
             
-            # 估算时间（假设每秒处理1000行）
-            preview['estimated_time'] = max(1, preview['total_rows'] // 1000)
+            # 估算时间（按 ESTIMATED_ROWS_PER_SECOND 行/秒）
+            preview['estimated_time'] = max(1, preview['total_rows'] // ESTIMATED_ROWS_PER_SECOND)
             
         except Exception as e:
             logging.error(f"获取预览信息失败: {e}")
         finally:
-            self.mysql_connector.disconnect()
+            if opened_here:
+                self.mysql_connector.disconnect()
         
         return preview
 
 
+class _WorkerPool:
+    """按线程缓存工作迁移器，同一线程迁移多个表时复用数据库连接"""
+    
+    def __init__(self, migrator: MySQLToPostgreSQLMigrator):
+        self._migrator = migrator
+        self._local = threading.local()
+        self._workers: List[MySQLToPostgreSQLMigrator] = []
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> MySQLToPostgreSQLMigrator:
+        """获取当前线程的工作迁移器，首次调用时建立连接"""
+        worker = getattr(self._local, 'worker', None)
+        if worker is not None:
+            # 流式读取提前结束时 MySQL 连接会被断开，这里重新连接
+            if worker.mysql_connector.connect():
+                return worker
+            self.discard()
+        
+        worker = self._migrator._create_worker()
+        try:
+            if not worker.mysql_connector.connect():
+                raise Exception("无法连接到MySQL数据库")
+            
+            if not worker.pg_connector.connect():
+                raise Exception("无法连接到PostgreSQL数据库")
+            
+            worker.pg_connector.configure_bulk_load_session()
+        except Exception:
+            worker.mysql_connector.disconnect()
+            worker.pg_connector.disconnect()
+            raise
+        
+        self._local.worker = worker
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+    
+    def discard(self):
+        """断开并丢弃当前线程的工作迁移器"""
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            return
+        self._local.worker = None
+        with self._lock:
+            self._workers.remove(worker)
+        worker.mysql_connector.disconnect()
+        worker.pg_connector.disconnect()
+    
+    def close(self):
+        """断开所有工作迁移器的连接"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.mysql_connector.disconnect()
+            worker.pg_connector.disconnect()
+
+
 # 兼容性函数，保持与原代码示例的一致性
 if __name__ == "__main__":
     # 这里是为了兼容原始的代码示例
@@ -3,15 +3,63 @@
 Logging utilities for database migration.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
 
 
+# 当前配置 (level, log_file) 和后台写日志的监听器
+_current_config = None
+_listener = None
+
+# 日志文件缓冲的记录条数，缓冲满或出现 ERROR 级别日志时才写入文件
+LOG_FILE_BUFFER_RECORDS = 1024
+
+
+def _stop_listener():
+    """停止后台日志线程，写出队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            # MemoryHandler 关闭时只写出缓冲，不会关闭目标文件
+            target = getattr(handler, 'target', None)
+            handler.close()
+            if target is not None:
+                target.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """按秒缓存时间字符串的格式化器，同一秒内的日志不再重复调用 localtime/strftime"""
+    
+    def __init__(self, fmt: str, datefmt: str):
+        super().__init__(fmt, datefmt=datefmt)
+        self._cached_second = None
+        self._cached_time = ''
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(self.datefmt, self.converter(second))
+            self._cached_second = second
+        return self._cached_time
+
+
 def setup_logger(level: str = 'INFO', log_file: str = None) -> logging.Logger:
     """
     设置日志记录器
     
+    相同参数重复调用时直接返回已配置的记录器。日志通过队列交给后台线程
+    格式化和写出，记录日志的线程不会阻塞在控制台或文件 I/O 上。
+    
     Args:
         level: 日志级别 (DEBUG, INFO, WARNING, ERROR)
         log_file: 日志文件路径 (可选)
@@ -19,10 +67,17 @@ def setup_logger(level: str = 'INFO', log_file: str = None) -> logging.Logger:
     Returns:
         logging.Logger: 配置好的日志记录器
     """
+    global _current_config, _listener
+    
     # 获取根日志记录器
     logger = logging.getLogger()
     
+    config = (level.upper(), log_file)
+    if config == _current_config:
+        return logger
+    
     # 清除已有的处理器
+    _stop_listener()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
     
@@ -36,7 +91,7 @@ def setup_logger(level: str = 'INFO', log_file: str = None) -> logging.Logger:
     logger.setLevel(level_mapping.get(level.upper(), logging.INFO))
     
     # 设置日志格式
-    formatter = logging.Formatter(
+    formatter = _CachedTimeFormatter(
         '%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -44,12 +99,25 @@ def setup_logger(level: str = 'INFO', log_file: str = None) -> logging.Logger:
     # 控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # 文件处理器 (如果指定了日志文件)
+    # 文件处理器 (如果指定了日志文件，首次写日志时才打开文件；
+    # 攒够 LOG_FILE_BUFFER_RECORDS 条再批量写入，关闭时写出剩余日志)
     if log_file:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(logging.handlers.MemoryHandler(
+            LOG_FILE_BUFFER_RECORDS,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        ))
+    
+    # 记录日志的线程只把日志放入队列，由后台线程写出
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
-    return logger 
\ No newline at end of file
+    _current_config = config
+    return logger
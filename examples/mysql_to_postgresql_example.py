@@ -9,34 +9,42 @@ MySQL到PostgreSQL数据迁移完整示例
 使用方法:
 1. 修改下面的数据库配置信息
 2. 运行脚本: python examples/mysql_to_postgresql_example.py
+   （--yes 跳过确认，--no-preview 跳过迁移预览，适合脚本中自动运行）
 """
 
+import argparse
 import sys
 import os
 import logging
+import time
 from datetime import datetime
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from db_migrator.migrators.mysql_to_postgresql import MySQLToPostgreSQLMigrator
+from db_migrator.migrators.mysql_to_postgresql import DEFAULT_MAX_WORKERS, MySQLToPostgreSQLMigrator
+from db_migrator.utils.logger import setup_logger
 
 
 def setup_logging():
-    """设置日志配置"""
-    log_format = '%(asctime)s - %(levelname)s - %(message)s'
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(f'migration_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    """设置日志配置（日志由后台线程写入文件和控制台，迁移线程不等待 I/O）"""
+    setup_logger('INFO', f'migration_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="MySQL到PostgreSQL数据迁移示例")
+    parser.add_argument('-y', '--yes', action='store_true', help='不询问确认，直接开始迁移')
+    parser.add_argument('--no-preview', action='store_true', help='跳过迁移预览（不统计各表行数）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='同时迁移的表数量，每个线程使用独立的数据库连接（默认 %(default)s）')
+    return parser.parse_args()
 
 
 def main():
     """主函数"""
+    args = parse_args()
+    
     print("=" * 60)
     print("MySQL到PostgreSQL数据迁移工具")
     print("=" * 60)
@@ -68,9 +76,15 @@ def main():
     # 创建迁移器
     migrator = MySQLToPostgreSQLMigrator(mysql_config, postgresql_config)
     
-    # 设置进度回调
+    # 设置进度回调（进度行每秒最多输出10次，普通消息和完成时的进度总是输出）
+    last_progress_time = [0.0]
+    
     def progress_callback(message, current=0, total=0):
         if total > 0:
+            now = time.monotonic()
+            if current < total and now - last_progress_time[0] < 0.1:
+                return
+            last_progress_time[0] = now
             percentage = (current / total) * 100
             print(f"[{percentage:6.2f}%] {message}")
         else:
@@ -95,33 +109,35 @@ def main():
         print()
         
         # 2. 获取迁移预览
-        print("2. 获取迁移预览...")
-        preview = migrator.get_migration_preview()
-        
-        print(f"   📊 总表数: {len(preview['tables'])}")
-        print(f"   📊 总行数: {preview['total_rows']:,}")
-        print(f"   ⏱️  预计时间: {preview['estimated_time']} 秒")
-        print()
-        
-        if preview['tables']:
-            print("   表详情:")
-            for table_info in preview['tables'][:5]:  # 显示前5个表
-                print(f"   - {table_info['name']}: {table_info['rows']:,} 行, {table_info['columns']} 列")
+        if not args.no_preview:
+            print("2. 获取迁移预览...")
+            preview = migrator.get_migration_preview()
             
-            if len(preview['tables']) > 5:
-                print(f"   ... 还有 {len(preview['tables']) - 5} 个表")
+            print(f"   📊 总表数: {len(preview['tables'])}")
+            print(f"   📊 总行数: {preview['total_rows']:,}")
+            print(f"   ⏱️  预计时间: {preview['estimated_time']} 秒")
             print()
+            
+            if preview['tables']:
+                print("   表详情:")
+                for table_info in preview['tables'][:5]:  # 显示前5个表
+                    print(f"   - {table_info['name']}: {table_info['rows']:,} 行, {table_info['columns']} 列")
+                
+                if len(preview['tables']) > 5:
+                    print(f"   ... 还有 {len(preview['tables']) - 5} 个表")
+                print()
         
         # 3. 确认是否继续
-        while True:
-            choice = input("是否继续迁移？(y/n): ").lower().strip()
-            if choice in ['y', 'yes', '是']:
-                break
-            elif choice in ['n', 'no', '否']:
-                print("取消迁移。")
-                return True
-            else:
-                print("请输入 y 或 n")
+        if not args.yes:
+            while True:
+                choice = input("是否继续迁移？(y/n): ").lower().strip()
+                if choice in ['y', 'yes', '是']:
+                    break
+                elif choice in ['n', 'no', '否']:
+                    print("取消迁移。")
+                    return True
+                else:
+                    print("请输入 y 或 n")
         
         # 4. 开始迁移
         print("\n3. 开始数据迁移...")
@@ -130,15 +146,17 @@ def main():
         # 迁移配置
         migration_options = {
             'tables': None,          # None表示迁移所有表，或者指定表列表：['table1', 'table2']
-            'batch_size': 1000,      # 批处理大小
-            'include_indexes': True  # 是否包含索引迁移
+            'batch_size': 10000,     # 每次读取的行数
+            'include_indexes': True, # 是否包含索引迁移
+            'max_workers': args.workers  # 同时迁移的表数量，每个线程使用独立的数据库连接
         }
         
         # 执行迁移
         results = migrator.migrate(
             tables=migration_options['tables'],
             batch_size=migration_options['batch_size'],
-            include_indexes=migration_options['include_indexes']
+            include_indexes=migration_options['include_indexes'],
+            max_workers=migration_options['max_workers']
         )
         
         # 5. 显示迁移结果
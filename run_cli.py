@@ -3,6 +3,7 @@
 简单的数据库迁移测试脚本
 """
 
+import argparse
 import sys
 import os
 import logging
@@ -12,11 +13,22 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from db_migrator.migrators.mysql_to_postgresql import MySQLToPostgreSQLMigrator
+from db_migrator.migrators.mysql_to_postgresql import DEFAULT_MAX_WORKERS, MySQLToPostgreSQLMigrator
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="MySQL to PostgreSQL 迁移")
+    parser.add_argument('-y', '--yes', action='store_true', help='不询问确认，直接开始迁移')
+    parser.add_argument('--no-preview', action='store_true', help='跳过迁移预览（不统计各表行数）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='同时迁移的表数量，每个线程使用独立的数据库连接（默认 %(default)s）')
+    return parser.parse_args()
 
 
 def main():
     """主函数"""
+    args = parse_args()
     
     # 配置日志
     logging.basicConfig(
@@ -50,6 +62,14 @@ def main():
         print("\n1. 初始化迁移器...")
         migrator = MySQLToPostgreSQLMigrator(mysql_config, pg_config)
         
+        # 输出不是终端（如重定向到日志采集）时，只记录状态消息，不输出中间进度
+        if not sys.stdout.isatty():
+            def log_progress(message, current=0, total=0):
+                if total == 0:
+                    logging.info(message.strip())
+            
+            migrator.set_progress_callback(log_progress)
+        
         # 2. 测试连接
         print("\n2. 测试数据库连接...")
         connections = migrator.test_connections()
@@ -61,24 +81,26 @@ def main():
             return False
         
         # 3. 获取迁移预览
-        print("\n3. 获取迁移预览...")
-        preview = migrator.get_migration_preview()
-        
-        print(f"   📊 总表数: {len(preview['tables'])}")
-        print(f"   📊 总行数: {preview['total_rows']}")
-        print(f"   ⏱️  预计时间: {preview['estimated_time']} 秒")
+        if not args.no_preview:
+            print("\n3. 获取迁移预览...")
+            preview = migrator.get_migration_preview()
+            
+            print(f"   📊 总表数: {len(preview['tables'])}")
+            print(f"   📊 总行数: {preview['total_rows']}")
+            print(f"   ⏱️  预计时间: {preview['estimated_time']} 秒")
         
         # 4. 询问是否继续
-        response = input("\n是否继续迁移？(y/n): ").strip().lower()
-        if response != 'y':
-            print("迁移已取消")
-            return True
+        if not args.yes:
+            response = input("\n是否继续迁移？(y/n): ").strip().lower()
+            if response != 'y':
+                print("迁移已取消")
+                return True
         
         # 5. 执行迁移
         print("\n4. 开始数据迁移...")
         print("=" * 60)
         
-        results = migrator.migrate()
+        results = migrator.migrate(max_workers=args.workers)  # 同时迁移的表数量
         
         # 6. 显示结果
         print("\n" + "=" * 60)
@@ -3,14 +3,26 @@
 快速表选择迁移脚本
 """
 
+import argparse
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from db_migrator.migrators.mysql_to_postgresql import MySQLToPostgreSQLMigrator
+from db_migrator.migrators.mysql_to_postgresql import (
+    DEFAULT_MAX_WORKERS,
+    ESTIMATED_ROWS_PER_SECOND,
+    MySQLToPostgreSQLMigrator,
+)
 
 def main():
     """演示表选择功能"""
+    parser = argparse.ArgumentParser(description="快速表选择迁移")
+    parser.add_argument('-y', '--yes', action='store_true', help='选择表后不再询问确认，直接开始迁移')
+    parser.add_argument('--copy-threads', type=int, default=1,
+                        help='单个表按主键范围拆分后同时迁移的段数（默认1，不拆分）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='同时迁移的表数量，每个线程使用独立的数据库连接（默认 %(default)s）')
+    args = parser.parse_args()
     
     # 数据库配置
     mysql_config = {
@@ -71,23 +83,33 @@ def main():
         
         print(f"✅ 选择迁移以下表：{', '.join(selected_tables)}")
     
-    # 预览选择的表
+    # 预览选择的表（复用第一次预览的结果，不再重新查询行数）
     if selected_tables:
-        preview = migrator.get_migration_preview(selected_tables)
+        tables_by_name = {table['name']: table for table in preview['tables']}
+        selected_info = [tables_by_name[table] for table in selected_tables]
+        total_rows = sum(table['rows'] for table in selected_info)
+        preview = {
+            'tables': selected_info,
+            'total_rows': total_rows,
+            'estimated_time': max(1, total_rows // ESTIMATED_ROWS_PER_SECOND)
+        }
         print(f"\n📊 预览信息：")
         print(f"   表数量：{len(preview['tables'])}")
         print(f"   总行数：{preview['total_rows']:,}")
         print(f"   预计时间：{preview['estimated_time']} 秒")
     
     # 确认迁移
-    confirm = input("\n是否开始迁移？(y/n): ").strip().lower()
-    if confirm != 'y':
-        print("❌ 迁移已取消")
-        return
+    if not args.yes:
+        confirm = input("\n是否开始迁移？(y/n): ").strip().lower()
+        if confirm != 'y':
+            print("❌ 迁移已取消")
+            return
     
     # 开始迁移
     print("\n🚀 开始迁移...")
-    results = migrator.migrate(tables=selected_tables, batch_size=1000, include_indexes=True)
+    results = migrator.migrate(tables=selected_tables, batch_size=10000, include_indexes=True,
+                               max_workers=args.workers,  # 同时迁移的表数量
+                               copy_threads=args.copy_threads)
     
     # 显示结果
     print("\n" + "=" * 50)
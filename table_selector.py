@@ -9,9 +9,26 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import bisect
 import fnmatch
+import json
+import re
+import threading
+from collections import Counter
+from pathlib import Path
 from db_migrator.connectors.mysql_connector import MySQLConnector
 
+# 表元数据缓存目录
+CACHE_DIR = Path.home() / '.cache' / 'db-migrator'
+
+# 按表名推断表类型：一次正则匹配，按 _log、temp、backup、config 的优先顺序取第一个命中的分组
+_TABLE_TYPE_RE = re.compile(r'^(?:(?=.*(_log))|(?=.*(temp))|(?=.*(backup))|(?=.*(config)))',
+                            re.IGNORECASE | re.DOTALL)
+_TABLE_TYPES = (None, "日志", "临时", "备份", "配置")
+
+# 表列表每批插入的行数，超出部分在界面空闲时分批插入
+FILL_BATCH_ROWS = 500
+
 
 class TableSelectorDemo:
     def __init__(self):
@@ -21,12 +38,32 @@ class TableSelectorDemo:
         
         # 数据存储
         self.all_tables_data = []
+        # 表名 -> 表信息，避免每次查找都遍历 all_tables_data
+        self._by_name = {}
+        # 全部表名，供模式匹配使用
+        self._table_names = []
+        # 过滤用索引：表在列表中的位置、按行数排序的表及其行数、空表
+        self._position = {}
+        self._tables_by_rows = []
+        self._sorted_rows = []
+        self._empty_tables = []
+        # 正在加载数据库表时不再响应新的加载请求
+        self._loading = False
+        # 按连接配置缓存的连接器，重复加载时复用连接
+        self._connector_cache = {}
+        # 尚未插入完的表列表 (表, 待恢复选择的表名, 下一批起始位置) 和对应的空闲任务
+        self._pending_fill = None
+        self._fill_after_id = None
+        # 延迟执行的过滤任务和上次应用的过滤条件
+        self._filter_after_id = None
+        self._last_filter = None
         
         # 变量
         self.search_var = tk.StringVar()
         self.show_filter_var = tk.StringVar(value="all")
         
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # 预加载数据
         self.load_sample_data()
@@ -59,7 +96,11 @@ class TableSelectorDemo:
         mysql_entry = ttk.Entry(mysql_frame, textvariable=self.mysql_config_var, width=60)
         mysql_entry.pack(side="left", padx=(10, 5), fill="x", expand=True)
         
-        ttk.Button(mysql_frame, text="🔗 连接并加载表", command=self.load_real_data).pack(side="right")
+        load_button = ttk.Button(mysql_frame, text="🔗 连接并加载表", command=self.load_real_data)
+        load_button.pack(side="right")
+        # 按住 Shift 点击时忽略缓存，重新查询数据库
+        load_button.bind('<Shift-Button-1>',
+                         lambda e: (self.load_real_data(force_refresh=True), 'break')[1])
         
         # 操作按钮区域
         button_frame = ttk.Frame(self.root)
@@ -78,7 +119,7 @@ class TableSelectorDemo:
         ttk.Label(filter_frame, text="🔍 搜索:").pack(side="left")
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side="left", padx=(5, 15))
-        search_entry.bind('<KeyRelease>', self.filter_tables)
+        search_entry.bind('<KeyRelease>', self._schedule_filter)
         
         ttk.Label(filter_frame, text="显示:").pack(side="left")
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.show_filter_var, 
@@ -91,7 +132,7 @@ class TableSelectorDemo:
         self.size_threshold_var = tk.StringVar(value="10000")
         size_entry = ttk.Entry(filter_frame, textvariable=self.size_threshold_var, width=10)
         size_entry.pack(side="left", padx=(5, 0))
-        size_entry.bind('<KeyRelease>', self.filter_tables)
+        size_entry.bind('<KeyRelease>', self._schedule_filter)
         
         # 表列表区域
         list_frame = ttk.LabelFrame(self.root, text="表列表与详情")
@@ -121,17 +162,27 @@ class TableSelectorDemo:
         self.tree.column('type', width=80, minwidth=60)
         
         # 滚动条
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
         
         self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.tree_scrollbar.pack(side="right", fill="y")
         
         # 绑定事件
         self.tree.bind('<<TreeviewSelect>>', self.on_selection_change)
         self.tree.bind('<Double-1>', self.show_table_details)
         self.tree.bind('<Button-3>', self.show_context_menu)  # 右键菜单
         
+        # 右键菜单只创建一次，菜单命令作用于最近右键点击的项目
+        self._ctx_target = None
+        self._ctx_menu = tk.Menu(self.root, tearoff=0)
+        self._ctx_menu.add_command(label="📋 查看详情", command=lambda: self.show_table_details(None))
+        self._ctx_menu.add_separator()
+        self._ctx_menu.add_command(label="✅ 选择", command=lambda: self.tree.selection_add(self._ctx_target))
+        self._ctx_menu.add_command(label="❌ 取消选择", command=lambda: self.tree.selection_remove(self._ctx_target))
+        self._ctx_menu.add_separator()
+        self._ctx_menu.add_command(label="🔍 选择同类型表", command=self.select_same_type)
+        
         # 状态栏
         status_frame = ttk.Frame(self.root)
         status_frame.pack(fill="x", padx=10, pady=5)
@@ -164,22 +215,32 @@ class TableSelectorDemo:
         # 计算大小并完善数据
         for table in sample_tables:
             size_mb = table['rows'] * table['columns'] * 0.001
-            if size_mb < 1:
-                table['size'] = f"{size_mb*1000:.0f}KB"
-                table['size_mb'] = size_mb
-            elif size_mb < 1024:
-                table['size'] = f"{size_mb:.1f}MB"
-                table['size_mb'] = size_mb
-            else:
-                table['size'] = f"{size_mb/1024:.1f}GB"
-                table['size_mb'] = size_mb
+            table['size'] = self.format_size(size_mb)
+            table['size_mb'] = size_mb
         
         self.all_tables_data = sample_tables
         self.populate_table_list()
         self.update_status("✅ 示例数据加载完成")
 
-    def load_real_data(self):
-        """从真实数据库加载表数据"""
+    @staticmethod
+    def format_size(size_mb):
+        """格式化表大小"""
+        if size_mb < 1:
+            return f"{size_mb*1000:.0f}KB"
+        elif size_mb < 1024:
+            return f"{size_mb:.1f}MB"
+        else:
+            return f"{size_mb/1024:.1f}GB"
+
+    def load_real_data(self, force_refresh=False):
+        """从真实数据库加载表数据，查询在后台线程中进行，界面保持响应
+        
+        表结构指纹未变化时直接使用磁盘缓存，force_refresh 为 True 时强制重新查询。
+        当前显示过滤为大表、小表或空表时，只在服务端查询符合条件的表。
+        """
+        if self._loading:
+            return
+        
         try:
             config_str = self.mysql_config_var.get()
             # 解析连接字符串 user:pass@host:port/db
@@ -198,92 +259,264 @@ class TableSelectorDemo:
                 'password': user_pass[1],
                 'database': host_port_db[1]
             }
+        except Exception as e:
+            messagebox.showerror("加载错误", f"加载数据时发生错误:\n{str(e)}")
+            self.update_status("❌ 数据加载失败")
+            return
+        
+        # 按行数过滤的条件交给 information_schema 查询
+        show_filter = self.show_filter_var.get()
+        try:
+            size_threshold = int(self.size_threshold_var.get())
+        except ValueError:
+            size_threshold = 10000
+        row_filter = {}
+        if show_filter == "large":
+            row_filter = {'min_rows': size_threshold}
+        elif show_filter == "small":
+            row_filter = {'max_rows': size_threshold - 1}
+        elif show_filter == "empty":
+            row_filter = {'max_rows': 0}
+        
+        # 相同配置复用已有连接器，connect() 在连接仍可用时不会重新握手
+        key = (mysql_config['host'], mysql_config['port'], mysql_config['username'],
+               mysql_config['password'], mysql_config['database'])
+        connector = self._connector_cache.get(key)
+        if connector is None:
+            connector = MySQLConnector(mysql_config)
+            self._connector_cache[key] = connector
+        
+        self._loading = True
+        self.update_status("🔄 正在连接数据库...")
+        threading.Thread(target=self._fetch_metadata, args=(connector, force_refresh, row_filter),
+                         daemon=True).start()
+
+    def _post_status(self, message):
+        """从后台线程更新状态栏"""
+        self.root.after(0, self.update_status, message)
+
+    def _fetch_metadata(self, connector, force_refresh=False, row_filter=None):
+        """后台线程：查询所有表的元数据，结果交回主线程显示（不直接操作界面组件）
+        
+        row_filter 为 get_schema_preview 的行数过滤参数，只加载部分表时不读写磁盘缓存。
+        """
+        try:
+            if not connector.connect():
+                self.root.after(0, self._on_load_failed, "连接错误", "无法连接到MySQL数据库", "❌ 数据库连接失败")
+                return
             
-            self.update_status("🔄 正在连接数据库...")
+            # 表结构未变化时使用磁盘缓存（只加载部分表时不使用缓存，也无需查询指纹）
+            if not row_filter:
+                cache_file = self._metadata_cache_file(connector.config)
+                fingerprint = connector.get_schema_fingerprint()
+                if not force_refresh:
+                    tables_data = self._read_metadata_cache(cache_file, fingerprint)
+                    if tables_data is not None:
+                        self.root.after(0, self._apply_metadata, tables_data, "（缓存）")
+                        return
             
-            connector = MySQLConnector(mysql_config)
-            if connector.connect():
+            self._post_status("📊 正在获取表信息...")
+            
+            # 两次 information_schema 查询获取所有表的行数（估算值）、列数和实际大小
+            if row_filter:
+                schema_preview = connector.get_schema_preview(**row_filter)
+                tables = sorted(schema_preview)
+            else:
+                schema_preview = connector.get_schema_preview()
                 tables = connector.get_tables()
-                self.all_tables_data = []
-                
-                self.update_status(f"📊 正在获取 {len(tables)} 个表的信息...")
-                
-                for i, table_name in enumerate(tables):
-                    try:
+            tables_data = []
+            
+            for table_name in tables:
+                try:
+                    info = schema_preview.get(table_name, {})
+                    rows = info.get('rows')
+                    if rows is None:
                         rows = connector.get_table_count(table_name)
+                    columns = info.get('columns')
+                    if columns is None:
                         structure = connector.get_table_structure(table_name)
                         columns = len(structure) if structure else 0
-                        
-                        # 估算大小
-                        size_mb = rows * columns * 0.001
-                        if size_mb < 1:
-                            size_str = f"{size_mb*1000:.0f}KB"
-                        elif size_mb < 1024:
-                            size_str = f"{size_mb:.1f}MB"
-                        else:
-                            size_str = f"{size_mb/1024:.1f}GB"
-                        
-                        # 判断表类型
-                        table_type = "数据"
-                        if "_log" in table_name.lower():
-                            table_type = "日志"
-                        elif "temp" in table_name.lower():
-                            table_type = "临时"
-                        elif "backup" in table_name.lower():
-                            table_type = "备份"
-                        elif "config" in table_name.lower():
-                            table_type = "配置"
-                        
-                        table_info = {
-                            'name': table_name,
-                            'rows': rows,
-                            'columns': columns,
-                            'size': size_str,
-                            'size_mb': size_mb,
-                            'type': table_type
-                        }
-                        
-                        self.all_tables_data.append(table_info)
-                        
-                        # 更新进度
-                        if i % 5 == 0:  # 每5个表更新一次状态
-                            self.update_status(f"📊 正在获取表信息... ({i+1}/{len(tables)})")
-                            self.root.update()
                     
-                    except Exception as e:
-                        print(f"获取表 {table_name} 信息时出错: {e}")
-                
-                connector.disconnect()
-                self.populate_table_list()
-                self.update_status(f"✅ 成功加载 {len(self.all_tables_data)} 个表的信息")
+                    # 数据和索引实际占用的空间
+                    size_mb = info.get('size_bytes', 0) / (1024 * 1024)
+                    size_str = self.format_size(size_mb)
+                    
+                    # 判断表类型
+                    match = _TABLE_TYPE_RE.match(table_name)
+                    table_type = _TABLE_TYPES[match.lastindex] if match else "数据"
+                    
+                    table_info = {
+                        'name': table_name,
+                        'rows': rows,
+                        'columns': columns,
+                        'size': size_str,
+                        'size_mb': size_mb,
+                        'type': table_type
+                    }
+                    
+                    tables_data.append(table_info)
                 
+                except Exception as e:
+                    print(f"获取表 {table_name} 信息时出错: {e}")
+            
+            if row_filter:
+                self.root.after(0, self._apply_metadata, tables_data, "（仅符合当前显示过滤的表）")
             else:
-                messagebox.showerror("连接错误", "无法连接到MySQL数据库")
-                self.update_status("❌ 数据库连接失败")
+                self._write_metadata_cache(cache_file, fingerprint, tables_data)
+                self.root.after(0, self._apply_metadata, tables_data)
         
         except Exception as e:
-            messagebox.showerror("加载错误", f"加载数据时发生错误:\n{str(e)}")
-            self.update_status("❌ 数据加载失败")
+            self.root.after(0, self._on_load_failed, "加载错误", f"加载数据时发生错误:\n{str(e)}", "❌ 数据加载失败")
+
+    @staticmethod
+    def _metadata_cache_file(mysql_config):
+        """表元数据缓存文件路径"""
+        name = f"{mysql_config['host']}_{mysql_config['port']}_{mysql_config['database']}.json"
+        return CACHE_DIR / name.replace('/', '_')
+
+    @staticmethod
+    def _read_metadata_cache(cache_file, fingerprint):
+        """读取缓存的表元数据，缓存不存在、损坏或指纹不一致时返回 None"""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('fingerprint') != fingerprint:
+            return None
+        return cached.get('tables')
+
+    @staticmethod
+    def _write_metadata_cache(cache_file, fingerprint, tables_data):
+        """写入表元数据缓存，失败时忽略"""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'fingerprint': fingerprint, 'tables': tables_data}, f, ensure_ascii=False)
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            print(f"写入元数据缓存失败: {e}")
+
+    def _apply_metadata(self, tables_data, source=""):
+        """主线程：显示后台线程加载的表数据"""
+        self._loading = False
+        self.all_tables_data = tables_data
+        self.populate_table_list()
+        self.update_status(f"✅ 成功加载 {len(self.all_tables_data)} 个表的信息{source}")
+
+    def _on_load_failed(self, title, message, status):
+        """主线程：显示加载失败信息"""
+        self._loading = False
+        messagebox.showerror(title, message)
+        self.update_status(status)
 
     def populate_table_list(self):
         """填充表列表"""
-        # 清空现有项目
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._by_name = {table_info['name']: table_info for table_info in self.all_tables_data}
+        self._table_names = list(self._by_name)
+        self._last_filter = None
         
-        # 添加表数据
+        # 预先建立过滤索引，按行数过滤时只需二分查找
+        self._position = {name: i for i, name in enumerate(self._table_names)}
+        self._tables_by_rows = sorted(self.all_tables_data, key=lambda t: t['rows'])
+        self._sorted_rows = [table_info['rows'] for table_info in self._tables_by_rows]
+        self._empty_tables = [table_info for table_info in self.all_tables_data if table_info['rows'] == 0]
+        
+        # 行数显示文本只格式化一次，过滤时直接复用
         for table_info in self.all_tables_data:
-            self.tree.insert('', 'end', text='☐',
-                values=(table_info['name'], 
-                       f"{table_info['rows']:,}",
+            table_info['rows_text'] = f"{table_info['rows']:,}"
+        
+        self.fill_tree(self.all_tables_data)
+        self.update_selection_info()
+
+    def fill_tree(self, tables, selected_tables=()):
+        """清空树形视图并插入表
+
+        第一批插入期间暂时移除视图以避免逐行重新布局；表较多时其余部分在界面空闲时
+        分批插入，首屏无需等待全部插入完成。选择在全部插入后一次性恢复。
+        """
+        self._cancel_fill()
+        pack_info = self.tree.pack_info()
+        self.tree.pack_forget()
+        try:
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
+            self._insert_rows(tables[:FILL_BATCH_ROWS], selected_tables)
+        finally:
+            self.tree.pack(pack_info, before=self.tree_scrollbar)
+        
+        restore = {table_info['name'] for table_info in tables
+                   if table_info['name'] in selected_tables}
+        if len(tables) > FILL_BATCH_ROWS:
+            self._pending_fill = (tables, restore, FILL_BATCH_ROWS)
+            self._fill_after_id = self.root.after_idle(self._fill_tree_rest)
+        elif restore:
+            self.tree.selection_set(list(restore))
+
+    def _fill_tree_rest(self):
+        """空闲时插入下一批表，最后一批插入后恢复选择"""
+        self._fill_after_id = None
+        if self._pending_fill is None:
+            return
+        
+        tables, restore, start = self._pending_fill
+        end = start + FILL_BATCH_ROWS
+        self._insert_rows(tables[start:end], restore)
+        if end < len(tables):
+            self._pending_fill = (tables, restore, end)
+            self._fill_after_id = self.root.after_idle(self._fill_tree_rest)
+        else:
+            self._complete_fill(restore)
+
+    def _finish_fill(self):
+        """立即插入尚未插入的表，供需要完整列表的操作在执行前调用"""
+        if self._pending_fill is None:
+            return
+        
+        tables, restore, start = self._pending_fill
+        self._cancel_fill()
+        self._insert_rows(tables[start:], restore)
+        self._complete_fill(restore)
+
+    def _cancel_fill(self):
+        """放弃尚未完成的分批插入"""
+        if self._fill_after_id is not None:
+            self.root.after_cancel(self._fill_after_id)
+            self._fill_after_id = None
+        self._pending_fill = None
+
+    def _complete_fill(self, restore):
+        """全部插入后一次性恢复选择并更新选择信息"""
+        self._pending_fill = None
+        if restore:
+            # 与插入期间用户做出的选择合并，只触发一次选择事件
+            self.tree.selection_add(list(restore))
+        self.update_selection_info()
+
+    def _insert_rows(self, tables, selected_tables):
+        """在列表末尾插入一批表，选中的表显示选择标记"""
+        for table_info in tables:
+            table_name = table_info['name']
+            # 以表名作为项目 ID，之后直接由 ID 得到表名
+            self.tree.insert('', 'end', iid=table_name,
+                text='☑' if table_name in selected_tables else '☐',
+                values=(table_name,
+                       table_info['rows_text'],
                        table_info['size'],
                        table_info['columns'],
                        table_info['type']))
-        
-        self.update_selection_info()
+
+    def _schedule_filter(self, event=None):
+        """输入停顿 150ms 后再过滤，快速输入时不逐字重建列表"""
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(150, self.filter_tables)
 
     def filter_tables(self, event=None):
         """过滤表列表"""
+        self._filter_after_id = None
         search_text = self.search_var.get().lower()
         show_filter = self.show_filter_var.get()
         
@@ -292,82 +525,70 @@ class TableSelectorDemo:
         except ValueError:
             size_threshold = 10000
         
-        # 清空现有显示
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # 过滤条件未变化时无需重建列表（按选中状态过滤时结果还取决于当前选择）
+        current_filter = (search_text, show_filter, size_threshold)
+        if current_filter == self._last_filter and show_filter not in ("selected", "unselected"):
+            return
+        self._last_filter = current_filter
         
         # 获取选中的表
         selected_tables = self.get_selected_tables()
         
-        # 过滤并显示表
-        for table_info in self.all_tables_data:
+        # 应用显示过滤：借助索引只遍历可能匹配的表，并保持原有顺序
+        if show_filter == "empty":
+            candidates = self._empty_tables
+        elif show_filter in ("large", "small"):
+            cut = bisect.bisect_left(self._sorted_rows, size_threshold)
+            matched = self._tables_by_rows[cut:] if show_filter == "large" else self._tables_by_rows[:cut]
+            candidates = sorted(matched, key=lambda t: self._position[t['name']])
+        elif show_filter == "selected":
+            candidates = [self._by_name[name]
+                          for name in sorted(selected_tables, key=self._position.get)]
+        else:
+            candidates = self.all_tables_data
+        
+        # 应用搜索过滤
+        visible_tables = []
+        for table_info in candidates:
             table_name = table_info['name']
-            is_selected = table_name in selected_tables
-            
-            # 应用搜索过滤
             if search_text and search_text not in table_name.lower():
                 continue
-            
-            # 应用显示过滤
-            if show_filter == "selected" and not is_selected:
-                continue
-            elif show_filter == "unselected" and is_selected:
-                continue
-            elif show_filter == "large" and table_info['rows'] < size_threshold:
-                continue
-            elif show_filter == "small" and table_info['rows'] >= size_threshold:
+            if show_filter == "unselected" and table_name in selected_tables:
                 continue
-            elif show_filter == "empty" and table_info['rows'] > 0:
-                continue
-            
-            # 设置选择标记
-            check_mark = '☑' if is_selected else '☐'
-            
-            item_id = self.tree.insert('', 'end', text=check_mark,
-                values=(table_name, 
-                       f"{table_info['rows']:,}",
-                       table_info['size'],
-                       table_info['columns'],
-                       table_info['type']))
-            
-            # 如果是选中的表，添加选择
-            if is_selected:
-                self.tree.selection_add(item_id)
+            visible_tables.append(table_info)
         
+        # 批量显示，保留选中状态
+        self.fill_tree(visible_tables, selected_tables)
         self.update_selection_info()
 
     def get_selected_tables(self):
-        """获取选中的表"""
-        selection = self.tree.selection()
-        selected_tables = []
-        for item_id in selection:
-            table_name = self.tree.item(item_id)['values'][0]
-            selected_tables.append(table_name)
+        """获取选中的表名集合，包括分批插入完成后才恢复选择的表"""
+        # 项目 ID 即表名
+        selected_tables = set(self.tree.selection())
+        if self._pending_fill is not None:
+            selected_tables.update(self._pending_fill[1])
         return selected_tables
 
     def select_all(self):
         """全选"""
-        for item in self.tree.get_children():
-            self.tree.selection_add(item)
+        self._finish_fill()
+        self.tree.selection_set(self.tree.get_children())
         self.update_selection_marks()
 
     def deselect_all(self):
         """全不选"""
+        self._finish_fill()
         self.tree.selection_remove(self.tree.get_children())
         self.update_selection_marks()
 
     def invert_selection(self):
         """反选"""
-        current_selection = self.tree.selection()
-        all_items = self.tree.get_children()
-        
-        # 先取消所有选择
-        self.tree.selection_remove(all_items)
+        self._finish_fill()
+        current_selection = set(self.tree.selection())
         
-        # 选择之前未选择的项目
-        for item in all_items:
-            if item not in current_selection:
-                self.tree.selection_add(item)
+        # 一次性改为选择之前未选择的项目
+        self.tree.selection_set([item for item in self.tree.get_children()
+                                 if item not in current_selection])
         
         self.update_selection_marks()
 
@@ -376,26 +597,30 @@ class TableSelectorDemo:
         selected_tables = self.get_selected_tables()
         
         for item in self.tree.get_children():
-            table_name = self.tree.item(item)['values'][0]
-            check_mark = '☑' if table_name in selected_tables else '☐'
+            check_mark = '☑' if item in selected_tables else '☐'
             self.tree.item(item, text=check_mark)
         
         self.update_selection_info()
 
     def on_selection_change(self, event=None):
         """选择变化事件"""
+        self._finish_fill()
         self.update_selection_marks()
 
     def update_selection_info(self):
-        """更新选择信息"""
+        """更新选择信息，分批插入期间跳过，插入完成后再更新"""
+        if self._pending_fill is not None:
+            return
+        
         total = len(self.tree.get_children())
         selected = len(self.tree.selection())
         
         # 计算选中表的总行数
         selected_tables = self.get_selected_tables()
         total_rows = 0
-        for table_info in self.all_tables_data:
-            if table_info['name'] in selected_tables:
+        for table_name in selected_tables:
+            table_info = self._by_name.get(table_name)
+            if table_info:
                 total_rows += table_info['rows']
         
         info_text = f"选中: {selected}/{total} | 总行数: {total_rows:,}"
@@ -404,7 +629,6 @@ class TableSelectorDemo:
     def update_status(self, message):
         """更新状态栏"""
         self.status_label.configure(text=message)
-        self.root.update()
 
     def pattern_select_dialog(self):
         """按模式选择对话框"""
@@ -459,15 +683,17 @@ class TableSelectorDemo:
         preview_list.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
         preview_scroll.pack(side="right", fill="y", pady=5)
         
-        def update_preview(*args):
+        preview_job = None
+        
+        def update_preview():
+            nonlocal preview_job
+            preview_job = None
             pattern = pattern_var.get()
             preview_list.delete(0, tk.END)
             
             if pattern:
-                matched = []
-                for table_info in self.all_tables_data:
-                    if fnmatch.fnmatch(table_info['name'], pattern):
-                        matched.append(table_info['name'])
+                # fnmatch.filter 只编译一次模式
+                matched = fnmatch.filter(self._table_names, pattern)
                 
                 if matched:
                     preview_list.insert(0, f"--- 匹配到 {len(matched)} 个表 ---")
@@ -476,7 +702,22 @@ class TableSelectorDemo:
                 else:
                     preview_list.insert(0, "--- 没有匹配的表 ---")
         
-        pattern_var.trace('w', update_preview)
+        def schedule_preview(*args):
+            # 输入停顿 150ms 后再刷新预览，快速输入时不逐字匹配
+            nonlocal preview_job
+            if preview_job is not None:
+                dialog.after_cancel(preview_job)
+            preview_job = dialog.after(150, update_preview)
+        
+        pattern_var.trace_add('write', schedule_preview)
+        
+        def close_dialog():
+            # 取消尚未执行的预览刷新，避免对话框销毁后回调报错
+            if preview_job is not None:
+                dialog.after_cancel(preview_job)
+            dialog.destroy()
+        
+        dialog.protocol("WM_DELETE_WINDOW", close_dialog)
         
         # 按钮
         button_frame = ttk.Frame(dialog)
@@ -485,20 +726,16 @@ class TableSelectorDemo:
         def apply_pattern():
             pattern = pattern_var.get()
             if pattern:
-                # 先清空选择
-                self.deselect_all()
-                
-                # 选择匹配的表
-                for item in self.tree.get_children():
-                    table_name = self.tree.item(item)['values'][0]
-                    if fnmatch.fnmatch(table_name, pattern):
-                        self.tree.selection_add(item)
+                self._finish_fill()
+                # 只选择当前显示的表中匹配的表（项目 ID 即表名）
+                matched = fnmatch.filter(self.tree.get_children(), pattern)
+                self.tree.selection_set(matched)
                 
                 self.update_selection_marks()
-                dialog.destroy()
+                close_dialog()
         
         ttk.Button(button_frame, text="应用", command=apply_pattern).pack(side="right", padx=(5, 0))
-        ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side="right")
+        ttk.Button(button_frame, text="取消", command=close_dialog).pack(side="right")
 
     def show_stats(self):
         """显示统计信息"""
@@ -507,23 +744,26 @@ class TableSelectorDemo:
             return
         
         total_tables = len(self.all_tables_data)
-        total_rows = sum(table['rows'] for table in self.all_tables_data)
-        total_size_mb = sum(table['size_mb'] for table in self.all_tables_data)
         
-        # 按类型统计
-        type_stats = {}
+        # 一次遍历完成总量、按类型统计、最大表和空表统计
+        total_rows = 0
+        total_size_mb = 0.0
+        type_count = Counter()
+        type_rows = Counter()
+        largest_table = None
+        empty_tables = []
         for table in self.all_tables_data:
-            table_type = table['type']
-            if table_type not in type_stats:
-                type_stats[table_type] = {'count': 0, 'rows': 0}
-            type_stats[table_type]['count'] += 1
-            type_stats[table_type]['rows'] += table['rows']
-        
-        # 找出最大的表
-        largest_table = max(self.all_tables_data, key=lambda x: x['rows']) if self.all_tables_data else None
-        
-        # 空表统计
-        empty_tables = [table for table in self.all_tables_data if table['rows'] == 0]
+            rows = table['rows']
+            total_rows += rows
+            total_size_mb += table['size_mb']
+            
+            type_count[table['type']] += 1
+            type_rows[table['type']] += rows
+            
+            if largest_table is None or rows > largest_table['rows']:
+                largest_table = table
+            if rows == 0:
+                empty_tables.append(table)
         
         message = f"📊 数据库统计信息\n\n"
         message += f"总表数: {total_tables}\n"
@@ -531,8 +771,8 @@ class TableSelectorDemo:
         message += f"估算大小: {total_size_mb:.1f} MB\n\n"
         
         message += f"按类型统计:\n"
-        for table_type, stats in type_stats.items():
-            message += f"  {table_type}: {stats['count']} 个表, {stats['rows']:,} 行\n"
+        for table_type, count in type_count.items():
+            message += f"  {table_type}: {count} 个表, {type_rows[table_type]:,} 行\n"
         
         if largest_table:
             message += f"\n最大表: {largest_table['name']}\n"
@@ -554,15 +794,10 @@ class TableSelectorDemo:
         if not selection:
             return
         
-        item = selection[0]
-        table_name = self.tree.item(item)['values'][0]
+        table_name = selection[0]
         
         # 找到表信息
-        table_info = None
-        for info in self.all_tables_data:
-            if info['name'] == table_name:
-                table_info = info
-                break
+        table_info = self._by_name.get(table_name)
         
         if not table_info:
             return
@@ -601,39 +836,37 @@ class TableSelectorDemo:
         item = self.tree.identify_row(event.y)
         if item:
             self.tree.selection_set(item)
-            
-            # 创建右键菜单
-            context_menu = tk.Menu(self.root, tearoff=0)
-            context_menu.add_command(label="📋 查看详情", command=lambda: self.show_table_details(None))
-            context_menu.add_separator()
-            context_menu.add_command(label="✅ 选择", command=lambda: self.tree.selection_add(item))
-            context_menu.add_command(label="❌ 取消选择", command=lambda: self.tree.selection_remove(item))
-            context_menu.add_separator()
-            context_menu.add_command(label="🔍 选择同类型表", command=self.select_same_type)
+            self._ctx_target = item
             
             try:
-                context_menu.tk_popup(event.x_root, event.y_root)
+                self._ctx_menu.tk_popup(event.x_root, event.y_root)
             finally:
-                context_menu.grab_release()
+                self._ctx_menu.grab_release()
 
     def select_same_type(self):
         """选择相同类型的表"""
+        self._finish_fill()
         selection = self.tree.selection()
         if not selection:
             return
         
-        item = selection[0]
-        table_name = self.tree.item(item)['values'][0]
-        table_type = self.tree.item(item)['values'][4]
+        table_type = self.tree.set(selection[0], 'type')
         
         # 选择所有相同类型的表
-        for item in self.tree.get_children():
-            if self.tree.item(item)['values'][4] == table_type:
-                self.tree.selection_add(item)
+        same_type = [item for item in self.tree.get_children()
+                     if self._by_name[item]['type'] == table_type]
+        self.tree.selection_add(same_type)
         
         self.update_selection_marks()
         messagebox.showinfo("批量选择", f"已选择所有 '{table_type}' 类型的表")
 
+    def on_close(self):
+        """关闭窗口时断开所有缓存的数据库连接"""
+        for connector in self._connector_cache.values():
+            connector.disconnect()
+        self._connector_cache.clear()
+        self.root.destroy()
+
     def run(self):
         """运行演示"""
         self.root.mainloop()
@@ -27,14 +27,18 @@ def test_mysql():
         connector.connect()
         print("✅ MySQL 连接成功!")
         
-        # 获取所有数据库
+        # 在服务端检查目标数据库是否存在，不拉取全部数据库列表
         cursor = connector.connection.cursor()
-        cursor.execute("SHOW DATABASES")
-        databases = [row[0] for row in cursor.fetchall()]
-        print(f"📊 可用数据库: {databases}")
+        try:
+            cursor.execute(
+                "SELECT SCHEMA_NAME FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = %s LIMIT 1",
+                (mysql_config['database'],)
+            )
+            database_exists = cursor.fetchone() is not None
+        finally:
+            cursor.close()
         
-        # 检查目标数据库是否存在
-        if mysql_config['database'] in databases:
+        if database_exists:
             print(f"✅ 数据库 '{mysql_config['database']}' 存在")
             
             # 获取表列表
@@ -47,7 +51,6 @@ def test_mysql():
         else:
             print(f"❌ 数据库 '{mysql_config['database']}' 不存在")
         
-        cursor.close()
         connector.disconnect()
         
     except Exception as e:
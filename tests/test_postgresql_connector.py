@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL 连接器二进制 COPY 测试
+
+需要真实 PostgreSQL 的测试通过环境变量 DB_MIGRATOR_TEST_PG_HOST 等指定连接，未设置时跳过。
+"""
+
+import io
+import os
+import struct
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("mysql.connector")
+
+from db_migrator.connectors.postgresql_connector import PostgreSQLConnector
+
+
+def _copy_binary_payload(column_types, rows):
+    """执行 copy_data_binary，返回发送给 COPY 的二进制数据"""
+    connector = PostgreSQLConnector({})
+    connector.connection = mock.MagicMock()
+    payload = io.BytesIO()
+    cursor = connector.connection.cursor.return_value.__enter__.return_value
+    cursor.copy_expert.side_effect = lambda sql_text, buffer: payload.write(buffer.read())
+
+    columns = [f"c{i}" for i in range(len(column_types))]
+    assert connector.copy_data_binary("t", columns, column_types, rows)
+    return payload.getvalue()
+
+
+def _decode_fields(payload):
+    """解析单行二进制 COPY 数据中的各字段"""
+    offset = 19  # 文件头
+    field_count, = struct.unpack_from('>h', payload, offset)
+    offset += 2
+    fields = []
+    for _ in range(field_count):
+        length, = struct.unpack_from('>i', payload, offset)
+        offset += 4
+        fields.append(payload[offset:offset + length])
+        offset += length
+    return fields
+
+
+def test_binary_copy_encodes_int_and_decimal_as_text():
+    payload = _copy_binary_payload(['text', 'text', 'text', 'text'],
+                                   [(2024, 0, Decimal('12.50'), b'raw')])
+    assert _decode_fields(payload) == [b'2024', b'0', b'12.50', b'raw']
+
+
+def _copy_csv_payload(rows):
+    """执行 copy_data，返回发送给 COPY 的 CSV 文本"""
+    connector = PostgreSQLConnector({})
+    connector.connection = mock.MagicMock()
+    payload = io.StringIO()
+    cursor = connector.connection.cursor.return_value.__enter__.return_value
+    cursor.copy_expert.side_effect = lambda sql_text, buffer: payload.write(buffer.read())
+
+    columns = [f"c{i}" for i in range(len(rows[0]))]
+    assert connector.copy_data("t", columns, rows)
+    return payload.getvalue()
+
+
+def test_csv_copy_writes_binary_values_as_hex():
+    payload = _copy_csv_payload([(b'\x01\x02ab', bytearray(b'ab'), memoryview(b'\xff'), None, 'text')])
+    assert payload == '"\\x01026162","\\x6162","\\xff",nan,"text"\r\n'
+
+
+@pytest.mark.skipif(not os.environ.get('DB_MIGRATOR_TEST_PG_HOST'),
+                    reason="未设置 DB_MIGRATOR_TEST_PG_HOST")
+def test_binary_copy_int_and_decimal_into_text_column():
+    connector = PostgreSQLConnector({
+        'host': os.environ['DB_MIGRATOR_TEST_PG_HOST'],
+        'port': int(os.environ.get('DB_MIGRATOR_TEST_PG_PORT', 5432)),
+        'username': os.environ.get('DB_MIGRATOR_TEST_PG_USER', 'postgres'),
+        'password': os.environ.get('DB_MIGRATOR_TEST_PG_PASSWORD', ''),
+        'database': os.environ.get('DB_MIGRATOR_TEST_PG_DATABASE', 'postgres')
+    })
+    assert connector.connect()
+    try:
+        with connector.connection.cursor() as cursor:
+            cursor.execute('CREATE TEMP TABLE "encode_text_test" (a text, b text, c text)')
+
+        assert connector.copy_data_binary(
+            'encode_text_test', ['a', 'b', 'c'], ['text', 'text', 'text'],
+            [(2024, 0, Decimal('12.50'))], commit=False
+        )
+
+        with connector.connection.cursor() as cursor:
+            cursor.execute('SELECT a, b, c FROM "encode_text_test"')
+            assert cursor.fetchall() == [('2024', '0', '12.50')]
+    finally:
+        connector.connection.rollback()
+        connector.disconnect()